@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pattern audit for the service-matching catalog in generate_data.py.
+
+Every compiled pattern (ALIASES, service names and DESC_SAFE_ALIASES) is timed
+on inputs of doubling length:
+  - adversarial: each literal run of the pattern repeated on its own, so a
+    prefix like "battery" occurs everywhere but the rest never completes
+  - generic: runs of letters, spaces, digits and punctuation
+  - real: the longest descriptions of the Jira export, tiled to length
+A pattern is flagged when doubling the input multiplies its time by more than
+2**THRESHOLD (default: growth exponent 1.5, i.e. clearly worse than linear).
+
+Usage:
+  python3 scripts/audit_patterns.py                # audit all patterns; exit 1 if any is flagged
+  python3 scripts/audit_patterns.py --max-size 32768 --threshold 1.3
+"""
+import argparse
+import math
+import sys
+import time
+
+import generate_data as gd
+
+SIZES_FROM = 2048
+GENERIC_UNITS = ("a", " ", "0", "-", ".", "a ", "\n")
+MIN_FLAG_MS = 1.0  # below this even a quadratic pattern is harmless at --max-size
+STALL_S = 2.0      # stop growing an input once a single search takes this long
+
+
+def _time_search(rx, text):
+    """Seconds per rx.search(text): best of 3 batches of about 0.5 ms each."""
+    t0 = time.perf_counter()
+    rx.search(text)
+    first = time.perf_counter() - t0
+    if first > 0.01:
+        return first
+    number = max(1, int(0.0005 / max(first, 1e-7)))
+    best = first
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            rx.search(text)
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def _literal_runs(rx):
+    """Literal runs anywhere in the pattern (not only required ones), as written."""
+    try:
+        parsed = gd._sre_parse.parse(rx.pattern, rx.flags)
+    except Exception:
+        return []
+    runs, run = [], []
+
+    def walk(items):
+        for op, av in items:
+            if op is gd._LITERAL:
+                run.append(chr(av))
+                continue
+            if run:
+                runs.append("".join(run))
+                run.clear()
+            if op is gd._SUBPATTERN:
+                walk(av[-1])
+            elif op in gd._REPEATS:
+                walk(av[2])
+            elif op is gd._BRANCH:
+                for alt in av[1]:
+                    walk(alt)
+                    if run:
+                        runs.append("".join(run))
+                        run.clear()
+    walk(parsed)
+    if run:
+        runs.append("".join(run))
+    return list(dict.fromkeys(r for r in runs if r.strip()))
+
+
+def _inputs(rx, real_text):
+    """(label, unit) pairs; each unit is tiled to the target length."""
+    units = [(f"repeat {r!r}", r + " ") for r in _literal_runs(rx)]
+    units += [(f"generic {u!r}", u) for u in GENERIC_UNITS]
+    if real_text:
+        units.append(("real descriptions", real_text))
+    return units
+
+
+def _tile(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def audit_pattern(rx, real_text, sizes):
+    """Worst (growth exponent, input label, seconds at the largest size) over all inputs.
+
+    The exponent is the slope of log(time) over log(size) between the smallest
+    and the largest size: ~1 for linear scans, ~2 for quadratic backtracking.
+    """
+    worst = (0.0, "", 0.0)
+    for label, unit in _inputs(rx, real_text):
+        first = None
+        for size in sizes:
+            t = _time_search(rx, _tile(unit, size))
+            if first is None:
+                first = (size, max(t, 1e-9))
+                continue
+            if t > STALL_S:
+                worst = max(worst, (math.inf, f"{label} @ {size} (stalled)", t))
+                break
+            if size == sizes[-1] and t * 1000 >= MIN_FLAG_MS:
+                exponent = math.log(t / first[1]) / math.log(size / first[0])
+                worst = max(worst, (exponent, f"{label} @ {size}", t))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-size", type=int, default=16384, help="largest input length in characters")
+    parser.add_argument("--threshold", type=float, default=1.5, help="growth exponent that flags a pattern")
+    args = parser.parse_args()
+
+    sizes = []
+    size = SIZES_FROM
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 2
+
+    services = gd.load_services()
+    summary_set, desc_set = gd.build_matchers(services)
+    try:
+        tickets = gd.load_tickets()
+        longest = sorted((t.get("description", "") or "" for t in tickets), key=len)[-20:]
+        real_text = "\n".join(d for d in longest if isinstance(d, str))
+    except OSError as e:
+        print(f"  Warning: no Jira export ({e}), skipping real inputs")
+        real_text = ""
+
+    patterns = [("summary", name, rx) for name, rx in summary_set]
+    patterns += [("description", name, rx) for name, rx in desc_set]
+    print(f"Auditing {len(patterns)} patterns on inputs of {sizes[0]}..{sizes[-1]} chars"
+          f" (RE2 {'available' if gd._re2 else 'not installed'})")
+    flagged = []
+    for i, (set_name, name, rx) in enumerate(patterns, 1):
+        exponent, label, seconds = audit_pattern(rx, real_text, sizes)
+        if exponent > args.threshold:
+            flagged.append({"set": set_name, "service": name, "pattern": rx.pattern,
+                            "exponent": exponent, "input": label, "ms": seconds * 1000,
+                            "re2": "yes" if gd.re2_pattern(rx) else "no"})
+        if i % 50 == 0:
+            print(f"  {i}/{len(patterns)} patterns, {len(flagged)} flagged")
+
+    print(f"\n{len(flagged)} super-linear patterns (growth exponent > {args.threshold}):")
+    for f in sorted(flagged, key=lambda f: -f["ms"]):
+        print(f"  [{f['set']}] {f['service']}: {f['pattern']}")
+        print(f"      exponent {f['exponent']:.2f}, {f['ms']:.1f} ms on {f['input']}, RE2-expressible: {f['re2']}")
+    translatable = sum(1 for _, _, rx in patterns if gd.re2_pattern(rx))
+    print(f"\nRE2-expressible: {translatable}/{len(patterns)} patterns (the rest fall back to re)")
+    if flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1099 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the generate_data.py pipeline.
+
+Each benchmark runs against the real sources configured in generate_data.py
+(Jira export under _System/_Data); the Coda ones run against scripts/mock_coda.py,
+unpaced unless they measure the rate limiter. Measurements that depend on process-wide
+state (peak RSS) run every variant in a fresh subprocess.
+
+Usage:
+  python3 scripts/benchmarks.py load     # json.load() vs. streaming loader vs. ticket snapshot
+  python3 scripts/benchmarks.py match    # match engines (sequential, prefilter, re2): tickets/sec + equivalence
+  python3 scripts/benchmarks.py desc     # description windows: per-ticket cost histogram + changed assignments
+  python3 scripts/benchmarks.py orgs     # OrgIndex vs. linear startswith() scan: identical matches + timing
+  python3 scripts/benchmarks.py orgindex # OrgIndex vs. linear scan on synthetic keys (edge cases + fuzzing), no data needed
+  python3 scripts/benchmarks.py names    # NgramIndex vs. linear substring scan over person names
+  python3 scripts/benchmarks.py entities # entity table reused across two runs, one customer renamed: same links as resolving afresh
+  python3 scripts/benchmarks.py incidence  # sparse incidence overlaps vs. pairwise set intersections
+  python3 scripts/benchmarks.py correlation  # lagged service × month correlations vs. naive per-pair Pearson
+  python3 scripts/benchmarks.py roles    # matrix role-carrier scoring vs. per-person loop, incl. 50 hypothetical roles
+  python3 scripts/benchmarks.py ngrams   # bounded-memory word/bigram/trigram heavy hitters vs. exact counts
+  python3 scripts/benchmarks.py clusters # MinHash/LSH near-duplicate clustering vs. exact all-pairs Jaccard
+  python3 scripts/benchmarks.py coda     # concurrent Coda table prefetch vs. one after another, against a mock server
+  python3 scripts/benchmarks.py session  # pooled keep-alive CodaClient vs. urlopen() per page over HTTPS: per-page latency
+  python3 scripts/benchmarks.py cache    # Coda mirror: cold/warm/revalidated syncs, circuit breaker on a dead server, --offline
+  python3 scripts/benchmarks.py sync     # incremental Coda mirror sync vs. full re-download under daily churn
+  python3 scripts/benchmarks.py ratelimit  # paced + retried Coda requests vs. unpaced ones against a rate-limited, flaky mock
+  python3 scripts/benchmarks.py workers  # --workers scaling of classify_tickets at 1/2/4/8 processes
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import generate_data as gd
+from mock_coda import MockCoda, synthetic_tables, timestamp
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB.
+
+    Prefers VmHWM: ru_maxrss survives fork+exec on Linux, so a child would
+    report the parent's peak.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_variant(bench, variant):
+    """Run one benchmark variant in a fresh interpreter and return its JSON result."""
+    out = subprocess.run(
+        [sys.executable, __file__, bench, "--variant", variant],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _print_table(rows, columns):
+    widths = [max(len(str(c)), *(len(str(r.get(c, ""))) for r in rows)) for c in columns]
+    print("  " + "  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for r in rows:
+        print("  " + "  ".join(str(r.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
+
+
+# ── Jira loader ──
+
+def _load_jira_json_load():
+    """The previous loader: json.load() the whole export, then flatten it."""
+    with open(gd.JIRA_EXPORT) as f:
+        raw = json.load(f)
+    tickets = []
+    for proj, data in raw.items():
+        for issue in data["issues"]:
+            issue["project"] = proj
+            tickets.append(issue)
+    return tickets
+
+
+LOAD_VARIANTS = {
+    "json.load": _load_jira_json_load,
+    "stream": gd.load_jira,
+    # Streamed and projected into compact Ticket records
+    "stream-tickets": lambda: gd.load_tickets(use_cache=False),
+    # Consumer that never materializes the list (counts only)
+    "stream-iter": lambda: sum(1 for _ in gd.iter_jira()),
+    # One-off conversion cost (written to a scratch file)
+    "snapshot-build": lambda: gd.build_jira_snapshot(
+        snapshot_path=Path(tempfile.mkdtemp()) / "jira_snapshot.bin"),
+    # Warm run: memory-map the existing snapshot
+    "snapshot": gd.load_tickets,
+}
+
+
+def bench_load(variant=None):
+    if variant:
+        base = _peak_rss_mb()
+        t0 = time.perf_counter()
+        result = LOAD_VARIANTS[variant]()
+        wall = time.perf_counter() - t0
+        n = result if isinstance(result, int) else len(result)
+        print(json.dumps({
+            "variant": variant,
+            "tickets": n,
+            "wall_s": round(wall, 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "delta_rss_mb": round(_peak_rss_mb() - base, 1),
+        }))
+        return
+    size_mb = gd.JIRA_EXPORT.stat().st_size / 1024 / 1024
+    print(f"Jira loader: {gd.JIRA_EXPORT.name} ({size_mb:.1f} MB)")
+    gd.open_jira_snapshot().close()  # make sure the warm variant finds a current snapshot
+    rows = [_run_variant("load", v) for v in LOAD_VARIANTS]
+    _print_table(rows, ["variant", "tickets", "wall_s", "peak_rss_mb", "delta_rss_mb"])
+
+
+# ── Service matching ──
+
+def _assignments(tickets, services, engine):
+    """Build matchers for one engine and classify every ticket; returns (assignments, build_s, match_s)."""
+    t0 = time.perf_counter()
+    matchers = gd.build_matchers(services, engine)
+    t1 = time.perf_counter()
+    assignments = gd.assign_services(tickets, matchers)
+    return assignments, t1 - t0, time.perf_counter() - t1
+
+
+def bench_match(variant=None):
+    """Classify the full export with every engine; fails if any assignment differs."""
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    print(f"Service matching: {len(tickets)} tickets")
+    reference, build_s, match_s = _assignments(tickets, services, "sequential")
+    rows = [{"engine": "sequential", "build_s": round(build_s, 2), "match_s": round(match_s, 2),
+             "tickets_per_s": round(len(tickets) / match_s), "mismatches": "reference"}]
+    failed = False
+    for engine in gd.MATCH_ENGINES:
+        if engine == "sequential":
+            continue
+        assignments, build_s, match_s = _assignments(tickets, services, engine)
+        diff = [k for k, svc in reference.items() if assignments.get(k) != svc]
+        failed |= bool(diff)
+        rows.append({"engine": engine, "build_s": round(build_s, 2), "match_s": round(match_s, 2),
+                     "tickets_per_s": round(len(tickets) / match_s), "mismatches": len(diff)})
+        for key in diff[:10]:
+            print(f"  MISMATCH {engine} {key}: {reference[key]!r} != {assignments.get(key)!r}")
+    _print_table(rows, ["engine", "build_s", "match_s", "tickets_per_s", "mismatches"])
+    if failed:
+        sys.exit(1)
+
+
+# ── Description window ──
+
+DESC_WINDOWS = ("full", "1kb", "2kb", "4kb", "8kb", "16kb", "footer", "4kb+footer")
+
+
+def _cost_histogram(costs_us):
+    """Power-of-two latency buckets in µs: [(upper bound, count)]."""
+    buckets = Counter(max(int(c), 1).bit_length() for c in costs_us)
+    return [(1 << b, buckets[b]) for b in range(1, max(buckets) + 1)]
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+def bench_desc(variant=None):
+    """Time match_ticket() per ticket under each description window; count changed assignments."""
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    lengths = sorted(len(t.get("description", "") or "") for t in tickets)
+    print(f"Description windows: {len(tickets)} tickets, description length "
+          f"p50 {_percentile(lengths, .5)} / p99 {_percentile(lengths, .99)} / max {lengths[-1]} chars")
+    reference, rows, histograms = None, [], {}
+    for spec in DESC_WINDOWS:
+        matchers = gd.build_matchers(services, "prefilter", spec)
+        assignments, costs = {}, []
+        for t in tickets:
+            t0 = time.perf_counter_ns()
+            assignments[t["key"]] = gd.match_ticket(t, matchers)
+            costs.append((time.perf_counter_ns() - t0) / 1000)
+        if reference is None:
+            reference = assignments
+        changed = sum(1 for k, svc in reference.items() if assignments[k] != svc)
+        costs.sort()
+        histograms[spec] = _cost_histogram(costs)
+        rows.append({"window": spec, "total_s": round(sum(costs) / 1e6, 2),
+                     "p50_us": round(_percentile(costs, .5)), "p99_us": round(_percentile(costs, .99)),
+                     "max_us": round(costs[-1]), "changed": changed,
+                     "changed_pct": f"{changed / len(tickets) * 100:.2f}%"})
+    _print_table(rows, ["window", "total_s", "p50_us", "p99_us", "max_us", "changed", "changed_pct"])
+    for spec, hist in histograms.items():
+        print(f"\n  per-ticket cost, window {spec} (µs ≤ bucket: tickets)")
+        peak = max(n for _, n in hist)
+        for bound, n in hist:
+            print(f"    {bound:>8}  {n:>7}  {'#' * round(n / peak * 40)}")
+
+
+# ── Org resolution ──
+
+def _related_linear(items, query):
+    """The previous lookup: first key equal to, prefix of, or extending query."""
+    for key, value in items:
+        if query == key or query.startswith(key) or key.startswith(query):
+            return value
+    return None
+
+
+def bench_orgs(variant=None):
+    """Resolve every Jira customer and Coda org with OrgIndex and with the linear scan.
+
+    Key sets: Coda contracts, deals and organizations (empty, with a warning,
+    when Coda is unreachable), the Jira customer prefixes themselves and
+    their first halves.
+    Fails if any lookup differs.
+    """
+    tickets = gd.load_tickets()
+    customers = list(dict.fromkeys(c for c in map(gd.extract_customer, tickets) if c))
+    sources = {"jira customers": [(gd._norm_org(c), c) for c in customers],
+               # Half-length keys: every lookup goes through the prefix branches
+               "jira prefixes": [(gd._norm_org(c)[:(len(gd._norm_org(c)) + 1) // 2], c) for c in customers]}
+    for label, fetch, field in (("coda contracts", gd.fetch_contracts, "org"),
+                                ("coda deals", gd.fetch_deals, "org"),
+                                ("coda organizations", gd.fetch_organizations, "name")):
+        sources[label] = [(gd._norm_org(r[field]), r[field]) for r in fetch() if gd._norm_org(r[field])]
+    queries = [gd._norm_org(c) for c in customers]
+    queries += [key for items in sources.values() for key, _ in items]
+    print(f"Org resolution: {len(queries)} queries")
+    rows, failed = [], False
+    for label, items in sources.items():
+        t0 = time.perf_counter()
+        reference = [_related_linear(items, q) for q in queries]
+        linear_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = gd.OrgIndex(items)
+        build_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        indexed = [index.related(q) for q in queries]
+        index_s = time.perf_counter() - t0
+        diff = [q for q, a, b in zip(queries, reference, indexed) if a != b]
+        failed |= bool(diff)
+        for q in diff[:10]:
+            print(f"  MISMATCH {label} {q!r}: {_related_linear(items, q)!r} != {index.related(q)!r}")
+        rows.append({"keys": label, "entries": len(items), "matched": sum(r is not None for r in reference),
+                     "linear_ms": round(linear_s * 1000, 1), "build_ms": round(build_s * 1000, 1),
+                     "index_ms": round(index_s * 1000, 1), "mismatches": len(diff)})
+    _print_table(rows, ["keys", "entries", "matched", "linear_ms", "build_ms", "index_ms", "mismatches"])
+    if failed:
+        sys.exit(1)
+
+
+ORGINDEX_CASES = [
+    # (keys in priority order, queries)
+    (["beck", "beckpackautomaten", "be"], ["beck", "beckpackautomaten", "beckx", "be", "b", "bec", "x", ""]),
+    (["abx", "aby", "abz"], ["ab", "a", "abx", "aby", "abyy", "abw"]),     # equal-length extensions: first wins
+    (["aby", "abx", "ab"], ["ab", "abx", "abxq", "a"]),                   # prefix after extensions in priority
+    (["acme", "acme", "acmegmbh"], ["acme", "acmegmbh", "acm"]),          # duplicate keys: first value
+    (["", "acme"], ["acme", "x", ""]),                                    # the empty key relates to everything
+    (["acme", ""], ["acme", "x", ""]),
+    ([], ["acme", ""]),
+]
+ORGINDEX_FUZZ = 2000
+
+
+def bench_orgindex(variant=None):
+    """OrgIndex.related() vs. the linear startswith() scan on synthetic keys; needs no data files.
+
+    Hand-written cases cover prefixes and extensions of the query, equal-length
+    ties, duplicate keys and the empty key; fuzzing adds random key sets over a
+    three-letter alphabet (dense in prefix relations) with random queries.
+    Fails if any lookup differs.
+    """
+    rng = random.Random(13)
+    cases = [([(key, n) for n, key in enumerate(keys)], queries) for keys, queries in ORGINDEX_CASES]
+    for _ in range(ORGINDEX_FUZZ):
+        keys = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 5))) for _ in range(rng.randint(1, 12))]
+        queries = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 6))) for _ in range(10)]
+        cases.append(([(key, n) for n, key in enumerate(keys)], queries + keys))
+    lookups = mismatches = 0
+    for items, queries in cases:
+        index = gd.OrgIndex(items)
+        for q in queries:
+            lookups += 1
+            expected, got = _related_linear(items, q), index.related(q)
+            if expected != got:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  MISMATCH keys={[k for k, _ in items]!r} query={q!r}: {expected!r} != {got!r}")
+    _print_table([{"cases": len(cases), "lookups": lookups, "mismatches": mismatches}],
+                 ["cases", "lookups", "mismatches"])
+    if mismatches:
+        sys.exit(1)
+
+
+def _substring_linear(names, query):
+    """The previous lookup: every name equal to, containing or contained in query."""
+    return [n for n in names if query == n or query in n or n in query]
+
+
+def bench_names(variant=None):
+    """Substring lookups of person names with NgramIndex and with the linear scan.
+
+    Indexed names: the normalized Jira assignees and reporters. Queries: the
+    names themselves, their first and last halves and each name with a suffix
+    (so both directions of the containment test are exercised).
+    Fails if any lookup differs.
+    """
+    tickets = gd.load_tickets()
+    people = {p for t in tickets for p in (t.get("assignee"), t.get("reporter")) if isinstance(p, str)}
+    names = sorted({gd._norm_org(p) for p in people})
+    queries = list(names)
+    queries += [n[:len(n) // 2] for n in names] + [n[len(n) // 2:] for n in names]
+    queries += [n + "extern" for n in names] + [""]
+    print(f"Name resolution: {len(names)} names, {len(queries)} queries")
+    t0 = time.perf_counter()
+    reference = [_substring_linear(names, q) for q in queries]
+    linear_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    index = gd.NgramIndex(names)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    indexed = [index.matches(q) for q in queries]
+    index_s = time.perf_counter() - t0
+    diff = [q for q, a, b in zip(queries, reference, indexed) if a != b]
+    for q in diff[:10]:
+        print(f"  MISMATCH {q!r}: {_substring_linear(names, q)!r} != {index.matches(q)!r}")
+    _print_table([{"names": len(names), "queries": len(queries),
+                   "matched": sum(bool(r) for r in reference), "linear_ms": round(linear_s * 1000, 1),
+                   "build_ms": round(build_s * 1000, 1), "index_ms": round(index_s * 1000, 1),
+                   "mismatches": len(diff)}],
+                 ["names", "queries", "matched", "linear_ms", "build_ms", "index_ms", "mismatches"])
+    if diff:
+        sys.exit(1)
+
+
+def bench_entities(variant=None):
+    """Link contract orgs to customers twice through one entity table, renaming a customer in between.
+
+    Customers: the Jira customer prefixes; orgs: the Coda contract orgs and the
+    customer names themselves. The second run changes the casing of one linked
+    customer (same normalized key), so its cached entry is reused. Fails if
+    either run links differently from resolving with an empty table.
+    """
+    tickets = gd.load_tickets()
+    customers = [{"name": c} for c in dict.fromkeys(c for c in map(gd.extract_customer, tickets) if c)]
+    orgs = [r["org"] for r in gd.fetch_contracts()] + [c["name"] for c in customers]
+    table = {}
+    rows, failed = [], False
+    for run in ("first", "renamed"):
+        if run == "renamed":
+            linked = next(c for c in customers if c["name"].swapcase() != c["name"])
+            customers = [{"name": c["name"].swapcase()} if c is linked else c for c in customers]
+        gd.RESOLUTION_STATS.update(cached=0, resolved=0)
+        t0 = time.perf_counter()
+        links = gd.link_customers(table, orgs, customers)
+        elapsed = time.perf_counter() - t0
+        stats = dict(gd.RESOLUTION_STATS)
+        fresh = gd.link_customers({}, orgs, customers)
+        diff = [org for org in orgs if links[org] is not fresh[org]]
+        failed |= bool(diff)
+        for org in diff[:10]:
+            print(f"  MISMATCH {run} {org!r}: {links[org]!r} != {fresh[org]!r}")
+        rows.append({"run": run, "orgs": len(orgs), "linked": sum(c is not None for c in links.values()),
+                     "cached": stats["cached"], "resolved": stats["resolved"],
+                     "ms": round(elapsed * 1000, 1), "mismatches": len(diff)})
+    _print_table(rows, ["run", "orgs", "linked", "cached", "resolved", "ms", "mismatches"])
+    if failed:
+        sys.exit(1)
+
+
+# ── Sparse incidence ──
+
+def _overlaps_pairwise(columns):
+    """The previous approach: one set intersection per column pair."""
+    names = list(columns)
+    result = {}
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            shared = len(columns[names[i]] & columns[names[j]])
+            if shared:
+                result[names[i], names[j]] = shared
+    return result
+
+
+def bench_incidence(variant=None):
+    """Incidence.overlaps() vs. pairwise set intersections, uncapped.
+
+    Matrices: customer × service (summary prefix as customer) and person ×
+    service (assignee, reporter). Fails if any shared count differs.
+    """
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    assignments, customers, _ = gd.classify_tickets(tickets, services)
+    matrices = {"customer × service": set(), "person × service": set()}
+    for t in tickets:
+        svc = assignments[t["key"]]
+        if not svc:
+            continue
+        if customers[t["key"]]:
+            matrices["customer × service"].add((customers[t["key"]], svc))
+        for person in (t.get("assignee"), t.get("reporter")):
+            if isinstance(person, str):
+                matrices["person × service"].add((person, svc))
+    rows, failed = [], False
+    for label, pairs in matrices.items():
+        columns = defaultdict(set)
+        for row, col in sorted(pairs):
+            columns[col].add(row)
+        t0 = time.perf_counter()
+        reference = _overlaps_pairwise(columns)
+        pairwise_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        incidence = gd.Incidence(((row, col) for col, rs in columns.items() for row in rs), columns=columns)
+        result = {(a, b): shared for a, b, shared, *_ in incidence.overlaps()}
+        sparse_s = time.perf_counter() - t0
+        diff = [k for k in reference.keys() | result.keys() if reference.get(k) != result.get(k)]
+        failed |= bool(diff)
+        for k in diff[:10]:
+            print(f"  MISMATCH {label} {k}: {reference.get(k)} != {result.get(k)}")
+        rows.append({"matrix": label, "rows": len({r for r, _ in pairs}), "columns": len(columns),
+                     "nonzeros": len(pairs), "pairs": len(reference),
+                     "pairwise_ms": round(pairwise_s * 1000, 1), "sparse_ms": round(sparse_s * 1000, 1),
+                     "mismatches": len(diff)})
+    _print_table(rows, ["matrix", "rows", "columns", "nonzeros", "pairs", "pairwise_ms", "sparse_ms", "mismatches"])
+    if failed:
+        sys.exit(1)
+
+
+# ── Temporal correlation ──
+
+def _pearson_naive(va, vb):
+    """The previous per-pair computation: centered sums over the two series."""
+    n = len(va)
+    mean_a, mean_b = sum(va) / n, sum(vb) / n
+    cov = sum((va[k] - mean_a) * (vb[k] - mean_b) for k in range(n))
+    std_a = sum((va[k] - mean_a) ** 2 for k in range(n)) ** 0.5
+    std_b = sum((vb[k] - mean_b) ** 2 for k in range(n)) ** 0.5
+    return cov / (std_a * std_b) if std_a > 0 and std_b > 0 else None
+
+
+def bench_correlation(variant=None):
+    """lagged_correlations() on the service × month matrix vs. naive Pearson per pair and lag.
+
+    Fails if any r differs by more than 1e-9 or a lag is present in only one result.
+    """
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    assignments, _, _ = gd.classify_tickets(tickets, services)
+    monthly = Counter((svc, t.get("created", "")[:7]) for t in tickets
+                      if (svc := assignments[t["key"]]) and t.get("created"))
+    names = [name for name, n in Counter(svc for svc, _ in monthly.elements()).most_common() if n > 100]
+    observed = sorted({m for _, m in monthly})
+    months = gd._month_range(observed[0], observed[-1])
+    rows = [[float(monthly[name, m]) for m in months] for name in names]
+    lag = gd.MAX_CORRELATION_LAG
+    print(f"Temporal correlation: {len(names)} services × {len(months)} months, lags ±{lag}")
+    t0 = time.perf_counter()
+    reference = {}
+    for i in range(len(rows)):
+        for j in range(i + 1, len(rows)):
+            for l in range(-lag, lag + 1):
+                a, b = rows[i][max(0, -l):len(months) - max(0, l)], rows[j][max(0, l):len(months) - max(0, -l)]
+                if len(a) >= gd.MIN_CORRELATION_MONTHS and (r := _pearson_naive(a, b)) is not None:
+                    reference[i, j, l] = r
+    naive_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = gd.lagged_correlations(rows)
+    matrix_s = time.perf_counter() - t0
+    flat = {(i, j, l): r for (i, j), by_lag in result.items() for l, r in by_lag.items()}
+    diff = [k for k in reference.keys() | flat.keys()
+            if k not in reference or k not in flat or abs(reference[k] - flat[k]) > 1e-9]
+    for k in diff[:10]:
+        print(f"  MISMATCH {names[k[0]]} / {names[k[1]]} lag {k[2]}: {reference.get(k)} != {flat.get(k)}")
+    _print_table([{"pairs": len(rows) * (len(rows) - 1) // 2, "correlations": len(reference),
+                   "naive_ms": round(naive_s * 1000, 1), "matrix_ms": round(matrix_s * 1000, 1),
+                   "mismatches": len(diff)}],
+                 ["pairs", "correlations", "naive_ms", "matrix_ms", "mismatches"])
+    if diff:
+        sys.exit(1)
+
+
+# ── Heavy hitters ──
+
+NGRAM_CAPACITIES = (128, 512, 2048, gd.HEAVY_HITTER_CAPACITY)
+NGRAM_TOP_K = 30
+
+
+def bench_ngrams(variant=None):
+    """Space-Saving n-gram summaries vs. exact Counters over all ticket summaries.
+
+    Per order and capacity: tracked entries, recall of the exact top-k and the
+    largest count error among them. Fails if a reported count violates
+    count - error <= true count <= count, or if a summary that never evicted
+    differs from the exact top-k.
+    """
+    tickets = gd.load_tickets()
+    stopwords = gd.load_stopwords()
+    exact = {n: Counter() for n in (1, 2, 3)}
+    for t in tickets:
+        words = [w.lower() for w in gd.NGRAM_WORD.findall(t.get("summary", ""))]
+        content = [len(w) > 3 and w not in stopwords for w in words]
+        for n, counter in exact.items():
+            for i in range(len(words) - n + 1):
+                if content[i] and content[i + n - 1]:
+                    counter[" ".join(words[i:i + n])] += 1
+    print(f"Heavy hitters: {len(tickets)} summaries, top {NGRAM_TOP_K}")
+    rows, failed = [], False
+    for capacity in NGRAM_CAPACITIES:
+        t0 = time.perf_counter()
+        summaries = gd.unmatched_ngrams(tickets, stopwords, capacity)
+        wall = time.perf_counter() - t0
+        for n, summary in summaries.items():
+            truth = exact[n]
+            reference = truth.most_common(NGRAM_TOP_K)
+            top = summary.top(NGRAM_TOP_K)
+            bad = [g for g, c, e, _ in summary.top(len(summary)) if not c - e <= truth[g] <= c]
+            if len(truth) <= capacity and [(g, c) for g, c, _, _ in top] != reference:
+                bad.append("exact top-k")
+            failed |= bool(bad)
+            for g in bad[:5]:
+                print(f"  VIOLATION {n}-gram @ {capacity}: {g!r}")
+            found = {g for g, *_ in top}
+            rows.append({"n": n, "capacity": capacity, "distinct": len(truth), "tracked": len(summary),
+                         "recall": f"{sum(g in found for g, _ in reference) / max(len(reference), 1):.2f}",
+                         "max_err": max((abs(c - truth[g]) for g, c, _, _ in top), default=0),
+                         "wall_ms": round(wall * 1000), "violations": len(bad)})
+    _print_table(rows, ["n", "capacity", "distinct", "tracked", "recall", "max_err", "wall_ms", "violations"])
+    if failed:
+        sys.exit(1)
+
+
+# ── Unmatched clustering ──
+
+CLUSTER_SAMPLE = 2000
+
+
+def bench_clusters(variant=None):
+    """lsh_clusters() vs. exact all-pairs Jaccard single linkage on a sample of summaries.
+
+    Sample: the first CLUSTER_SAMPLE distinct normalized summaries, plus a
+    digit-free variant of each (a word dropped), so near-duplicates exist.
+    Reports the share of exact similar pairs that LSH puts in one cluster, and
+    for those pairs the mean Jaccard similarity next to the share of agreeing
+    MinHash positions (equal for an unbiased family) and the share sharing an
+    LSH bucket next to the expected 1 - (1 - J^rows)^bands.
+    Fails if an LSH cluster spans two exact components (a link below the
+    similarity threshold).
+    """
+    tickets = gd.load_tickets()
+    texts = list(dict.fromkeys(filter(None, (gd._cluster_text(t.get("summary", "")) for t in tickets))))
+    texts = texts[:CLUSTER_SAMPLE]
+    texts += [" ".join(w for k, w in enumerate(t.split()) if k != 1) for t in texts if len(t.split()) > 3]
+    texts = list(dict.fromkeys(texts))
+    print(f"Unmatched clustering: {len(texts)} distinct summaries, threshold {gd.CLUSTER_SIMILARITY}")
+
+    t0 = time.perf_counter()
+    shingles = [gd._shingles(t) for t in texts]
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    pairs, jaccard = [], []
+    for i in range(len(texts)):
+        for j in range(i + 1, len(texts)):
+            a, b = shingles[i], shingles[j]
+            if len(a & b) >= gd.CLUSTER_SIMILARITY * len(a | b):
+                pairs.append((i, j))
+                jaccard.append(len(a & b) / len(a | b))
+                parent[find(j)] = find(i)
+    exact = [find(i) for i in range(len(texts))]
+    exact_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    groups = gd.lsh_clusters(texts)
+    lsh_s = time.perf_counter() - t0
+    cluster_of = {i: n for n, group in enumerate(groups) for i in group}
+    found = sum(cluster_of[i] == cluster_of[j] for i, j in pairs)
+    spanning = [g for g in groups if len({exact[i] for i in g}) > 1]
+    signatures = {i: gd.minhash(shingles[i]) for pair in pairs for i in pair}
+    rows = gd.MINHASH_PERMUTATIONS // gd.LSH_BANDS
+    agree = [sum(x == y for x, y in zip(signatures[i], signatures[j])) / gd.MINHASH_PERMUTATIONS
+             for i, j in pairs]
+    bucketed = sum(any(signatures[i][k:k + rows] == signatures[j][k:k + rows]
+                       for k in range(0, gd.MINHASH_PERMUTATIONS, rows)) for i, j in pairs)
+    expected = sum(1 - (1 - s ** rows) ** gd.LSH_BANDS for s in jaccard)
+    n = max(len(pairs), 1)
+    for g in spanning[:5]:
+        print(f"  SPANS COMPONENTS: {[texts[i] for i in g][:3]}")
+    _print_table([{"texts": len(texts), "similar_pairs": len(pairs),
+                   "pair_recall": f"{found / n:.3f}", "jaccard": f"{sum(jaccard) / n:.3f}",
+                   "sig_agree": f"{sum(agree) / n:.3f}", "bucketed": f"{bucketed / n:.3f}",
+                   "expected": f"{expected / n:.3f}",
+                   "clusters": sum(len(g) > 1 for g in groups), "exact_s": round(exact_s, 2),
+                   "lsh_s": round(lsh_s, 2), "violations": len(spanning)}],
+                 ["texts", "similar_pairs", "pair_recall", "jaccard", "sig_agree", "bucketed", "expected",
+                  "clusters", "exact_s", "lsh_s", "violations"])
+    if spanning:
+        sys.exit(1)
+
+
+# ── Role carriers ──
+
+HYPOTHETICAL_ROLES = 50
+
+
+def _score_role_loop(person_total, by_person_service, by_person_project, isms, sig):
+    """The previous scoring: one pass over all people per role, re-summing their counters."""
+    carriers = []
+    for person, total in person_total.most_common():
+        if total < sig["min_tickets"]:
+            continue
+        if sig["isms_filter"] and isms.get(person, 0) < sig["isms_min"]:
+            continue
+        svc_tix = sum(by_person_service[person].get(s, 0) for s in sig["services"])
+        proj_tix = sum(by_person_project[person].get(p, 0) for p in sig["projects"])
+        role_tix = svc_tix + (isms.get(person, 0) if sig["isms_as_role_signal"] else proj_tix)
+        if sig["min_role_tickets_abs"] and role_tix < sig["min_role_tickets_abs"]:
+            continue
+        coverage = role_tix / total
+        if coverage >= sig["min_coverage"]:
+            carriers.append((person, role_tix, coverage))
+    return carriers
+
+
+def bench_roles(variant=None):
+    """score_role_carriers() vs. the per-person loop for the configured and hypothetical roles.
+
+    Hypothetical roles: random service/project subsets with random thresholds.
+    Fails if any carrier list differs.
+    """
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    assignments, _, _ = gd.classify_tickets(tickets, services)
+    signatures = gd.load_role_signatures(service_names=set(services))
+    rng = random.Random(0)
+    projects = sorted({t.get("project") for t in tickets if t.get("project")})
+    for n in range(HYPOTHETICAL_ROLES):
+        signatures[f"hypothetical {n}"] = {
+            **{field: default for field, (_, default) in gd.ROLE_SIGNATURE_FIELDS.items()},
+            "services": rng.sample(sorted(services), rng.randint(1, 8)),
+            "projects": rng.sample(projects, rng.randint(0, min(2, len(projects)))),
+            "min_coverage": rng.choice((0.03, 0.1, 0.2)), "min_tickets": rng.choice((10, 20, 50)),
+        }
+    isms_re = re.compile(r"\b(isms|audit|datenschutz|compliance)\b", re.IGNORECASE)
+    print(f"Role carriers: {len(tickets)} tickets, {len(signatures)} signatures")
+
+    t0 = time.perf_counter()
+    counts = gd.PersonCounts(tickets, assignments, keyword=isms_re)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scored = {role: [(counts.people[i], n, c) for i, n, c in gd.score_role_carriers(counts, sig)]
+              for role, sig in signatures.items()}
+    matrix_s = time.perf_counter() - t0
+
+    person_total, isms = Counter(), Counter()
+    by_person_service, by_person_project = defaultdict(Counter), defaultdict(Counter)
+    for t in tickets:
+        person = t.get("assignee", "")
+        if not person:
+            continue
+        person_total[person] += 1
+        if assignments[t["key"]]:
+            by_person_service[person][assignments[t["key"]]] += 1
+        if t.get("project"):
+            by_person_project[person][t["project"]] += 1
+        if isms_re.search(t.get("summary", "")):
+            isms[person] += 1
+    t0 = time.perf_counter()
+    reference = {role: _score_role_loop(person_total, by_person_service, by_person_project, isms, sig)
+                 for role, sig in signatures.items()}
+    loop_s = time.perf_counter() - t0
+
+    diff = [role for role in signatures if scored[role] != reference[role]]
+    for role in diff[:10]:
+        print(f"  MISMATCH {role}: {len(scored[role])} carriers != {len(reference[role])}")
+    _print_table([{"signatures": len(signatures), "people": len(counts.people),
+                   "carriers": sum(map(len, scored.values())), "build_ms": round(build_s * 1000, 1),
+                   "loop_ms": round(loop_s * 1000, 1), "matrix_ms": round(matrix_s * 1000, 1),
+                   "per_role_us": round(matrix_s / len(signatures) * 1e6), "mismatches": len(diff)}],
+                 ["signatures", "people", "carriers", "build_ms", "loop_ms", "matrix_ms", "per_role_us", "mismatches"])
+    if diff:
+        sys.exit(1)
+
+
+# ── Parallel classification ──
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+CODA_LATENCY = 0.08  # seconds per mock request
+
+
+def _coda_fetch(table_ids, concurrency):
+    """Prefetch table_ids, then collect them the way the fetch_* functions do: (rows, errors, wall_s)."""
+    t0 = time.perf_counter()
+    if concurrency:
+        gd.prefetch_coda_tables(table_ids, concurrency)
+    rows, errors = {}, {}
+    for table_id in table_ids:
+        try:
+            rows[table_id] = gd._coda_fetch_all(table_id)
+        except Exception as e:
+            errors[table_id] = type(e).__name__
+    return rows, errors, time.perf_counter() - t0
+
+
+def bench_coda(variant=None):
+    """prefetch_coda_tables() vs. sequential _coda_fetch_all() against a local mock Coda server.
+
+    Tables of 1–6 pages at CODA_LATENCY per request; one failure scenario makes a
+    table answer 500, another makes one hang past the client timeout. The hang
+    opens the client's circuit breaker, so which other tables still arrive depends
+    on what was in flight: there, the tables that do arrive must match the
+    healthy fetch and the hanging one must fail. Elsewhere any table's rows or
+    error differing from the sequential fetch fails, as does exceeding the
+    concurrency limit.
+    """
+    table_ids = list(gd.CODA_TABLES)
+    sizes = {table_id: 150 + 250 * (i % 5) for i, table_id in enumerate(table_ids)}
+    sizes[table_ids[3]] = 1100  # one slow table of six pages
+    tables = {table_id: synthetic_tables([table_id], n)[table_id] for table_id, n in sizes.items()}
+    pages = sum(-(-n // 200) for n in sizes.values())
+    print(f"Mock Coda: {len(tables)} tables, {sum(sizes.values())} rows, {pages} pages,"
+          f" {CODA_LATENCY * 1000:.0f} ms per request")
+    gd.CODA_TIMEOUT = 1
+    scenarios = [("healthy", {}, ()),
+                 ("one 500", {table_ids[1]: 500}, ()),
+                 ("one hangs", {}, (table_ids[5],))]
+    rows, failed, healthy = [], False, None
+    for scenario, fail, hang in scenarios:
+        with MockCoda(tables, latency=CODA_LATENCY, fail=fail, hang=hang) as mock:
+            gd.CODA_API = mock.url
+            reference = None
+            for concurrency in (0, 1, 4, gd.CODA_MAX_CONCURRENT):
+                mock.reset()
+                gd._coda_client = gd.CodaClient(rate_limit=None, retries=0)  # the failing table fails at once
+                result, errors, wall = _coda_fetch(table_ids, concurrency)
+                if reference is None:
+                    reference, base_s = (result, errors), wall
+                    healthy = healthy or result
+                if hang:
+                    same = set(hang) <= set(errors) and all(rows_ == healthy[t] for t, rows_ in result.items())
+                else:
+                    same = (result, errors) == reference
+                within = mock.peak_in_flight <= max(concurrency, 1)
+                failed |= not (same and within)
+                rows.append({"scenario": scenario, "concurrency": concurrency or "sequential",
+                             "wall_s": round(wall, 2), "speedup": f"{base_s / wall:.2f}x",
+                             "requests": sum(mock.requests.values()), "peak_in_flight": mock.peak_in_flight,
+                             "failed_tables": len(errors), "identical": "yes" if same else "NO"})
+    _print_table(rows, ["scenario", "concurrency", "wall_s", "speedup", "requests", "peak_in_flight",
+                        "failed_tables", "identical"])
+    if failed:
+        sys.exit(1)
+
+
+class _UrlopenClient:
+    """The previous transport: one urlopen() per page, i.e. a new connection and TLS handshake each."""
+
+    mirror, unavailable = None, False
+
+    def __init__(self, base, ssl_context=None):
+        self.base, self.timeout, self.ssl_context = base, gd.CODA_TIMEOUT, ssl_context
+
+    def get(self, path, etag=None):
+        req = urllib.request.Request(self.base + path, headers={"Authorization": f"Bearer {gd.CODA_API_KEY}"})
+        with urllib.request.urlopen(req, timeout=self.timeout, context=self.ssl_context) as resp:
+            return resp.status, None, json.loads(resp.read())
+
+    def count(self, key):
+        pass
+
+    def close(self):
+        pass
+
+
+SESSION_RTT = 0.015  # simulated round trip: one per request, two per new TCP+TLS connection
+
+
+def bench_session(variant=None):
+    """CodaClient (keep-alive pool, gzip) vs. urlopen() per page against a local HTTPS mock.
+
+    Full syncs of all CODA_TABLES, one table after another and prefetched at
+    CODA_MAX_CONCURRENT. Fails if any table's rows differ between transports.
+    """
+    table_ids = list(gd.CODA_TABLES)
+    tables = {table_id: synthetic_tables([table_id], 150 + 250 * (i % 5))[table_id]
+              for i, table_id in enumerate(table_ids)}
+    pages = sum(-(-len(rows) // 200) for rows in tables.values())
+    try:
+        mock = MockCoda(tables, latency=SESSION_RTT, connect_delay=2 * SESSION_RTT, tls=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"  Warning: no self-signed certificate ({e}), falling back to plain HTTP")
+        mock = MockCoda(tables, latency=SESSION_RTT, connect_delay=2 * SESSION_RTT)
+    print(f"Mock Coda: {mock.url}, {len(tables)} tables, {pages} pages,"
+          f" {SESSION_RTT * 1000:.0f} ms per request + {2 * SESSION_RTT * 1000:.0f} ms per new connection")
+    gd.CODA_API = mock.url
+    rows, reference, failed = [], None, False
+    with mock:
+        for concurrency in (0, gd.CODA_MAX_CONCURRENT):
+            for transport in ("urlopen", "CodaClient"):
+                if transport == "urlopen":
+                    gd._coda_client = _UrlopenClient(mock.url, mock.client_context())
+                else:
+                    gd._coda_client = gd.CodaClient(mock.url, ssl_context=mock.client_context(), rate_limit=None)
+                mock.reset()
+                result, errors, wall = _coda_fetch(table_ids, concurrency)
+                if reference is None:
+                    reference, base_s = result, wall
+                same = not errors and result == reference
+                failed |= not same
+                rows.append({"concurrency": concurrency or "sequential", "transport": transport,
+                             "wall_s": round(wall, 2), "per_page_ms": round(wall / pages * 1000, 1),
+                             "speedup": f"{base_s / wall:.2f}x", "connections": mock.connections,
+                             "wire_kb": round(mock.bytes_sent / 1024), "identical": "yes" if same else "NO"})
+                gd._coda_client.close()
+    gd._coda_client = None
+    _print_table(rows, ["concurrency", "transport", "wall_s", "per_page_ms", "speedup", "connections",
+                        "wire_kb", "identical"])
+    if failed:
+        sys.exit(1)
+
+
+def bench_cache(variant=None):
+    """Coda syncs through the SQLite mirror against a local mock: healthy, hanging, down and offline.
+
+    Every mirrored scenario must return all tables identical to the cold sync,
+    and on a hanging or dead server the breaker must open within one client
+    timeout, also when tables are fetched one after another. Without the mirror
+    the breaker still fails fast, but every table comes back empty; the last
+    hanging row is the previous fetch (urlopen() per page, one table after
+    another), where each table waits out its own timeout.
+    """
+    table_ids = list(gd.CODA_TABLES)
+    tables = {table_id: synthetic_tables([table_id], 150 + 250 * (i % 5))[table_id]
+              for i, table_id in enumerate(table_ids)}
+    gd.CODA_TIMEOUT = 1
+    mock = MockCoda(tables, latency=0.02).start()
+    gd.CODA_API = mock.url
+    print(f"Mock Coda: {len(tables)} tables, {sum(-(-len(r) // 200) for r in tables.values())} pages,"
+          f" 20 ms per request, client timeout {gd.CODA_TIMEOUT}s")
+
+    scenarios = [  # (label, ttl, offline, client, concurrency, server state)
+        ("cold", 600, False, "mirror", gd.CODA_MAX_CONCURRENT, "up"),
+        ("warm, within TTL", 600, False, "mirror", gd.CODA_MAX_CONCURRENT, "up"),
+        ("TTL expired, no changes", 0, False, "mirror", gd.CODA_MAX_CONCURRENT, "up"),
+        ("--offline", 0, True, "mirror", gd.CODA_MAX_CONCURRENT, "up"),
+        ("server hangs", 0, False, "mirror", gd.CODA_MAX_CONCURRENT, "hang"),
+        ("server hangs, sequential", 0, False, "mirror", 0, "hang"),
+        ("server hangs, no mirror", 0, False, "no mirror", gd.CODA_MAX_CONCURRENT, "hang"),
+        ("server hangs, previous fetch", 0, False, "urlopen", 0, "hang"),
+        ("server down", 0, False, "mirror", gd.CODA_MAX_CONCURRENT, "down"),  # last: stops the mock
+    ]
+    rows, reference, failed = [], None, False
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, ttl, offline, kind, concurrency, server in scenarios:
+            mock.hang = set(table_ids) if server == "hang" else set()
+            if server == "down":
+                mock.stop()
+            mock.reset()
+            if kind == "urlopen":
+                client = _UrlopenClient(mock.url)
+            else:
+                mirror = gd.CodaMirror(Path(cache_dir) / "mirror.sqlite", ttl) if kind == "mirror" else None
+                client = gd.CodaClient(mirror=mirror, offline=offline, rate_limit=None)
+            gd._coda_client = client
+            result, errors, wall = _coda_fetch(table_ids, concurrency)
+            if reference is None:
+                reference = result
+            same = result == reference and not errors
+            broken = getattr(client, "broken", None) is not None
+            fast = server == "up" or kind == "urlopen" or (broken and wall < 2 * gd.CODA_TIMEOUT)
+            failed |= (kind == "mirror" and not same) or not fast
+            st = getattr(client, "stats", Counter())
+            rows.append({"scenario": label, "wall_s": round(wall, 2), "requests": sum(mock.requests.values()),
+                         "full": st["full"], "unchanged": st["unchanged"], "ttl_hits": st["cached"],
+                         "not_synced": st["stale"], "tables_ok": f"{len(table_ids) - len(errors)}/{len(table_ids)}",
+                         "breaker": "open" if broken else "-", "identical": "yes" if same else "NO"})
+            client.close()
+    gd._coda_client = None
+    _print_table(rows, ["scenario", "wall_s", "requests", "full", "unchanged", "ttl_hits", "not_synced",
+                        "tables_ok", "breaker", "identical"])
+    if failed:
+        sys.exit(1)
+
+
+SYNC_TABLE_ROWS = {"grid-8jIH1k4XCY": 20000, "grid-8gjU0zgevl": 8000}  # db_Tasks, db_Meetings; others 1500
+SYNC_CHURN = 0.01  # share of a table's rows touched per simulated day
+SYNC_DAYS = 3
+
+
+def _churn(tables, rng, clock):
+    """One day of edits: per table SYNC_CHURN of its rows, half updated, a third added, the rest deleted."""
+    for table_id, rows in tables.items():
+        k = max(3, int(len(rows) * SYNC_CHURN))
+        for row in rng.sample(rows, k // 2):
+            clock += 1
+            row["updatedAt"] = timestamp(clock)
+            row["values"] = {**row["values"], "c-WpKg032DXl": row["values"]["c-WpKg032DXl"] + " (edited)"}
+        for _ in range(k // 3):
+            clock += 1
+            rows.append({"id": f"n-{clock}", "createdAt": timestamp(clock), "updatedAt": timestamp(clock),
+                         "values": {"c-WpKg032DXl": f"{table_id} new {clock}"}})
+        for row in rng.sample(rows, k - k // 2 - k // 3):
+            rows.remove(row)
+    return clock
+
+
+def bench_sync(variant=None):
+    """Incremental CodaMirror syncs vs. re-downloading every table, over SYNC_DAYS days of churn.
+
+    After each incremental sync the mirror must equal the mock's tables apart
+    from deleted rows, which only the closing full sync removes; after that it
+    must equal them exactly.
+    """
+    table_ids = list(gd.CODA_TABLES)
+    tables = {table_id: synthetic_tables([table_id], SYNC_TABLE_ROWS.get(table_id, 1500))[table_id]
+              for table_id in table_ids}
+    clock = max(SYNC_TABLE_ROWS.values())
+    rng = random.Random(7)
+    mock = MockCoda(tables, latency=0.01).start()
+    gd.CODA_API = mock.url
+    print(f"Mock Coda: {len(tables)} tables, {sum(map(len, tables.values()))} rows,"
+          f" {SYNC_CHURN:.0%} churn per day, 10 ms per request")
+
+    rows, failed = [], False
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = Path(cache_dir) / "mirror.sqlite"
+        steps = [("initial full sync", 0)]
+        steps += [(f"day {day}: incremental", 1e9) for day in range(1, SYNC_DAYS + 1)]
+        steps += [(f"day {SYNC_DAYS}: re-download", None), (f"day {SYNC_DAYS}: full sync", 0)]
+        for label, full_interval in steps:
+            if label.endswith("incremental"):
+                clock = _churn(tables, rng, clock)
+            mirror = gd.CodaMirror(path, ttl=0, full_sync_interval=full_interval) if full_interval is not None else None
+            gd._coda_client = client = gd.CodaClient(mirror=mirror, rate_limit=None)
+            mock.reset()
+            t0 = time.perf_counter()
+            gd.prefetch_coda_tables(table_ids)
+            result = {table_id: gd._coda_fetch_all(table_id) for table_id in table_ids}
+            wall = time.perf_counter() - t0
+            deleted = 0
+            if mirror is None or label.endswith("full sync"):
+                same = result == tables
+            else:
+                live = {table_id: {row["id"] for row in source} for table_id, source in tables.items()}
+                kept = {table_id: [row for row in result[table_id] if row["id"] in live[table_id]]
+                        for table_id in table_ids}
+                deleted = sum(len(result[t]) - len(kept[t]) for t in table_ids)
+                same = kept == tables
+            failed |= not same
+            st = client.stats
+            rows.append({"step": label, "wall_s": round(wall, 2), "requests": st["requests"],
+                         "wire_kb": round(st["bytes"] / 1024), "changed_rows": st["changed"],
+                         "deleted_rows": st["deleted"] or (f"{deleted} pending" if deleted else 0),
+                         "identical": "yes" if same else "NO"})
+            client.close()
+    mock.stop()
+    gd._coda_client = None
+    _print_table(rows, ["step", "wall_s", "requests", "wire_kb", "changed_rows", "deleted_rows", "identical"])
+    if failed:
+        sys.exit(1)
+
+
+RATE_LIMIT = (40, 1.0)  # mock server limit: requests per window of seconds (Coda: 100 per 6s)
+
+
+PAUSE_RATE, PAUSE_BURST, PAUSE_S = 10.0, 5, 1.0  # TokenBucket pause check
+
+
+def _pause_spacing():
+    """Seconds from pause() to each of PAUSE_BURST acquire()s on a full TokenBucket."""
+    bucket = gd.TokenBucket(PAUSE_RATE, PAUSE_BURST)
+    t0 = time.monotonic()
+    bucket.pause(PAUSE_S)
+    times = []
+    for _ in range(PAUSE_BURST):
+        bucket.acquire()
+        times.append(time.monotonic() - t0)
+    return times
+
+
+def bench_ratelimit(variant=None):
+    """Concurrent Coda fetches against a mock that enforces RATE_LIMIT, with and without pacing/retries.
+
+    Fails unless the paced scenarios return every table identical to the mock's rows,
+    or if a TokenBucket lets any acquire() through during a pause() or sooner than
+    1/rate after the previous one once it ends (no burst builds up while paused).
+    """
+    times = _pause_spacing()
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    paused_ok = times[0] >= PAUSE_S and min(gaps) >= 0.9 / PAUSE_RATE
+    print(f"TokenBucket rate {PAUSE_RATE:g}/s, burst {PAUSE_BURST}, pause {PAUSE_S:g}s: acquires at "
+          + ", ".join(f"{t:.2f}" for t in times) + f"s ({'ok' if paused_ok else 'BURST AFTER PAUSE'})")
+    table_ids = list(gd.CODA_TABLES)
+    tables = {table_id: synthetic_tables([table_id], 450 + 750 * (i % 5))[table_id]
+              for i, table_id in enumerate(table_ids)}
+    pages = sum(-(-len(rows) // 200) for rows in tables.values())
+    print(f"Mock Coda: {len(tables)} tables, {pages} pages, limit {RATE_LIMIT[0]} requests per {RATE_LIMIT[1]:g}s,"
+          f" {gd.CODA_MAX_CONCURRENT} workers")
+    scenarios = [  # (label, client rate limit, retries, share of 503s)
+        ("unpaced, no retries", None, 0, 0.0),
+        ("unpaced, retries", None, gd.CODA_RETRIES, 0.0),
+        ("paced, retries", RATE_LIMIT, gd.CODA_RETRIES, 0.0),
+        ("paced, retries, 5% 503s", RATE_LIMIT, gd.CODA_RETRIES, 0.05),
+    ]
+    rows, failed = [], not paused_ok
+    for label, rate_limit, retries, flaky in scenarios:
+        with MockCoda(tables, latency=0.005, rate_limit=RATE_LIMIT, flaky=flaky) as mock:
+            gd.CODA_API = mock.url
+            gd._coda_client = client = gd.CodaClient(rate_limit=rate_limit, retries=retries, backoff=0.05)
+            result, errors, wall = _coda_fetch(table_ids, gd.CODA_MAX_CONCURRENT)
+            same = not errors and result == tables
+            failed |= rate_limit is not None and not same
+            st = client.stats
+            rows.append({"scenario": label, "wall_s": round(wall, 2), "requests": sum(mock.requests.values()),
+                         "429": mock.status_counts[429], "503": mock.status_counts[503], "retries": st["retries"],
+                         "paced_s": round(st["paced"], 1), "tables_ok": f"{len(table_ids) - len(errors)}/{len(table_ids)}",
+                         "identical": "yes" if same else "NO"})
+            client.close()
+    gd._coda_client = None
+    _print_table(rows, ["scenario", "wall_s", "requests", "429", "503", "retries", "paced_s", "tables_ok",
+                        "identical"])
+    if failed:
+        sys.exit(1)
+
+
+def bench_workers(variant=None):
+    """classify_tickets() at 1/2/4/8 worker processes; fails if any result differs."""
+    tickets = gd.load_tickets()
+    services = gd.load_services()
+    print(f"Parallel classification: {len(tickets)} tickets, {os.cpu_count()} CPUs")
+    rows, reference, base_s, failed = [], None, None, False
+    for workers in WORKER_COUNTS:
+        t0 = time.perf_counter()
+        result = gd.classify_tickets(tickets, services, workers=workers, use_cache=False)
+        wall = time.perf_counter() - t0
+        if reference is None:
+            reference, base_s = result, wall
+        same = result == reference
+        failed |= not same
+        rows.append({"workers": workers, "wall_s": round(wall, 2),
+                     "tickets_per_s": round(len(tickets) / wall), "speedup": f"{base_s / wall:.2f}x",
+                     "identical": "yes" if same else "NO"})
+    _print_table(rows, ["workers", "wall_s", "tickets_per_s", "speedup", "identical"])
+    if failed:
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    "load": bench_load,
+    "match": bench_match,
+    "desc": bench_desc,
+    "orgs": bench_orgs,
+    "orgindex": bench_orgindex,
+    "names": bench_names,
+    "entities": bench_entities,
+    "incidence": bench_incidence,
+    "correlation": bench_correlation,
+    "roles": bench_roles,
+    "ngrams": bench_ngrams,
+    "clusters": bench_clusters,
+    "coda": bench_coda,
+    "session": bench_session,
+    "cache": bench_cache,
+    "sync": bench_sync,
+    "ratelimit": bench_ratelimit,
+    "workers": bench_workers,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bench", choices=sorted(BENCHMARKS))
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    BENCHMARKS[args.bench](args.variant)
+
+
+if __name__ == "__main__":
+    main()
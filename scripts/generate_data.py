@@ -12,36 +12,472 @@ Sources:
 
 Output: public/data.json
 """
+import argparse
 import json
 import csv
+import gzip
+import hashlib
+import http.client
+import heapq
+import mmap
+import operator
+import os
+import random
 import re
-import urllib.request
+import sqlite3
+import sys
+import time
+import threading
+import urllib.error
+import zlib
+from array import array
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import combinations
 from pathlib import Path
-from datetime import date, datetime
+from urllib.parse import quote, urlsplit
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
 
 VAULT = Path(__file__).resolve().parents[4]  # Kultur/
 APP = Path(__file__).resolve().parents[1]     # history-learnings/
 CODA = VAULT / "_Rohdaten" / "Coda" / "2026-01-25"
 DATA = VAULT / "_System" / "_Data"
 
+CODA_API = os.environ.get("CODA_API_URL", "https://coda.io/apis/v1")
 CODA_API_KEY = "efa56a0c-da49-4297-ba87-e2275401363c"
 CODA_DOC_ID = "nt1X2O_PCv"          # Workspace HQ
 CODA_SPACES_TABLE_ID = "grid-Kkft_zZFFC"  # db_Spaces
 CODA_ORGS_TABLE_ID = "grid-miSV3rljB6"    # db_Organizations
 CODA_CONTRACTS_TABLE_ID = "grid-aEgKomlSSF"  # db_Contracts
 
+JIRA_EXPORT = DATA / "jira_export_2026-02-25.json"
+
 # ── Load Sources ──
 
+class _JsonStream:
+    """Incremental JSON reader: decodes one value at a time from a file.
+
+    The export is a single object ({project: {"issues": [...]}}), so json.load()
+    has to build the whole tree before the first ticket is usable. This reader
+    walks the containers by hand and only hands complete leaf values (one issue,
+    one metadata field) to json's raw_decode, keeping a bounded read buffer.
+    """
+
+    def __init__(self, f, chunk_size=1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed JSON: expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def _separator(self, close):
+        """Consume ',' or the closing bracket; True if more members follow."""
+        char = self.peek()
+        self.pos += 1
+        if char == close:
+            return False
+        if char != ",":
+            raise ValueError(f"Malformed JSON: expected ',' or {close!r}, found {char!r}")
+        return True
+
+    def keys(self):
+        """Iterate an object's keys; the caller must consume each value (value() or a nested walk)."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def items(self):
+        """Iterate an array's elements, decoding one element at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._separator("]"):
+                return
+
+
+def iter_jira(path=JIRA_EXPORT):
+    """Stream issues from the Jira export one project at a time.
+
+    Yields the same issue dicts as load_jira() (in export order, with
+    issue["project"] set) but never holds more than the current issue and a
+    read buffer in memory, so consumers can project or aggregate tickets
+    without the full parse tree.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        for proj in stream.keys():
+            for field in stream.keys():
+                if field != "issues":
+                    stream.value()  # project-level metadata (total, ...) is not used
+                    continue
+                for issue in stream.items():
+                    issue["project"] = proj
+                    yield issue
+
+
 def load_jira():
-    with open(DATA / "jira_export_2026-02-25.json") as f:
-        raw = json.load(f)
-    tickets = []
-    for proj, data in raw.items():
-        for issue in data["issues"]:
-            issue["project"] = proj
-            tickets.append(issue)
-    return tickets
+    # Built from the stream: peak memory is the ticket list, not parse tree + list
+    return list(iter_jira())
+
+
+# Issue fields the pipeline reads; everything else in the export is dropped
+TICKET_FIELDS = ("key", "project", "summary", "description", "assignee", "reporter",
+                 "created", "updated", "type", "status", "priority")
+# Low-cardinality fields: repeated across tens of thousands of tickets, so interned
+CATEGORICAL_FIELDS = {"project", "assignee", "reporter", "type", "status", "priority"}
+
+
+class Ticket:
+    """Compact ticket record holding only TICKET_FIELDS in slots.
+
+    Reads like the raw issue dict for the lookups the pipeline does
+    (t.get("summary", ""), t["key"]): a field missing from the export stays
+    unset, so .get() falls back to its default exactly as dict.get() would.
+    """
+
+    __slots__ = TICKET_FIELDS
+
+    def __init__(self, **fields):
+        for field, value in fields.items():
+            if field in CATEGORICAL_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    @classmethod
+    def from_issue(cls, issue):
+        return cls(**{f: issue[f] for f in TICKET_FIELDS if f in issue})
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __contains__(self, field):
+        return hasattr(self, field)
+
+    def __repr__(self):
+        return f"Ticket({self.get('key')!r})"
+
+
+# ── Ticket Snapshot Cache ──
+#
+# Columnar, memory-mapped copy of the export fields the pipeline reads. Built once
+# per export (keyed by size + mtime, confirmed by SHA-256 when the stat changes),
+# so later runs skip the JSON parse entirely.
+#
+# Layout: magic | u64 header length | JSON header | 8-byte aligned column buffers.
+#   categorical columns: int32 codes into a value dictionary stored in the header
+#                        (-1 = field missing from the issue)
+#   text columns:        int64 offsets (n+1) into a UTF-8 blob + one state byte per row
+
+CACHE = APP / ".cache"
+JIRA_SNAPSHOT = CACHE / "jira_snapshot.bin"
+
+_SNAPSHOT_MAGIC = b"HLSNAP1\n"
+# Text column row states
+_TEXT_STR, _TEXT_NONE, _TEXT_MISSING, _TEXT_JSON = 0, 1, 2, 3
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_jira_snapshot(source=JIRA_EXPORT, snapshot_path=JIRA_SNAPSHOT, sha256=None):
+    """Convert the Jira export into a columnar snapshot file (streamed, one pass).
+
+    Returns the number of tickets written.
+    """
+    st = source.stat()
+    sha256 = sha256 or _sha256_file(source)
+    cat_codes = {f: array("i") for f in TICKET_FIELDS if f in CATEGORICAL_FIELDS}
+    cat_values = {f: {} for f in cat_codes}
+    text_blob = {f: bytearray() for f in TICKET_FIELDS if f not in CATEGORICAL_FIELDS}
+    text_offsets = {f: array("q", [0]) for f in text_blob}
+    text_states = {f: bytearray() for f in text_blob}
+
+    count = 0
+    for issue in iter_jira(source):
+        count += 1
+        for f, codes in cat_codes.items():
+            if f not in issue:
+                codes.append(-1)
+                continue
+            lookup = cat_values[f]
+            value = issue[f]
+            marker = json.dumps(value)  # dictionary key that tells "None" from None
+            code = lookup.get(marker)
+            if code is None:
+                code = lookup[marker] = len(lookup)
+            codes.append(code)
+        for f, blob in text_blob.items():
+            value = issue.get(f)
+            if f not in issue:
+                state = _TEXT_MISSING
+            elif value is None:
+                state = _TEXT_NONE
+            elif isinstance(value, str):
+                state = _TEXT_STR
+                blob += value.encode("utf-8")
+            else:
+                state = _TEXT_JSON
+                blob += json.dumps(value, ensure_ascii=False).encode("utf-8")
+            text_states[f].append(state)
+            text_offsets[f].append(len(blob))
+
+    buffers = []
+    columns = {}
+    offset = 0
+
+    def add_buffer(data):
+        nonlocal offset
+        start = offset
+        buffers.append(data)
+        offset += len(data)
+        pad = -offset % 8
+        if pad:
+            buffers.append(b"\0" * pad)
+            offset += pad
+        return [start, len(data)]
+
+    for f in TICKET_FIELDS:
+        if f in cat_codes:
+            columns[f] = {
+                "kind": "categorical",
+                "codes": add_buffer(cat_codes[f].tobytes()),
+                "values": [json.loads(m) for m in cat_values[f]],
+            }
+        else:
+            columns[f] = {
+                "kind": "text",
+                "offsets": add_buffer(text_offsets[f].tobytes()),
+                "states": add_buffer(bytes(text_states[f])),
+                "data": add_buffer(bytes(text_blob[f])),
+            }
+
+    header = json.dumps({
+        "source": {"name": source.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256},
+        "count": count,
+        "byteorder": sys.byteorder,
+        "columns": columns,
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-(len(_SNAPSHOT_MAGIC) + 8 + len(header)) % 8)
+
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot_path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_SNAPSHOT_MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for data in buffers:
+            f.write(data)
+    os.replace(tmp, snapshot_path)
+    return count
+
+
+class JiraSnapshot:
+    """Read-only, memory-mapped view of a snapshot built by build_jira_snapshot().
+
+    Iterating yields one Ticket per row (a field missing from the issue stays
+    unset). Text is decoded from the mapping on access; categorical values are
+    decoded and interned once per distinct value.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a ticket snapshot (or an older format)")
+        pos = len(_SNAPSHOT_MAGIC)
+        header_len = int.from_bytes(self._mm[pos:pos + 8], "little")
+        pos += 8
+        try:
+            header = json.loads(self._mm[pos:pos + header_len].decode("utf-8"))
+            byteorder = header["byteorder"]
+        except (ValueError, KeyError, TypeError) as e:
+            self.close()
+            raise ValueError(f"{path}: corrupt snapshot header ({e!r})") from e
+        if byteorder != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path}: snapshot was written on a {byteorder}-endian host")
+        base = pos + header_len
+        self._categorical = {}
+        self._text = {}
+        view = memoryview(self._mm)
+
+        def buffer(span, fmt):
+            start, length = span
+            return view[base + start:base + start + length].cast(fmt)
+
+        try:
+            self.source = header["source"]
+            self.count = header["count"]
+            for f, col in header["columns"].items():
+                if col["kind"] == "categorical":
+                    values = [sys.intern(v) if type(v) is str else v for v in col["values"]]
+                    self._categorical[f] = (buffer(col["codes"], "i"), values)
+                else:
+                    self._text[f] = (buffer(col["offsets"], "q"), buffer(col["states"], "B"), buffer(col["data"], "B"))
+        except (ValueError, KeyError, TypeError) as e:
+            self._categorical = {}
+            self._text = {}
+            view.release()
+            self.close()
+            raise ValueError(f"{path}: corrupt snapshot header ({e!r})") from e
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        columns = [(f, self._categorical.get(f), self._text.get(f)) for f in TICKET_FIELDS
+                   if f in self._categorical or f in self._text]
+        for i in range(self.count):
+            ticket = Ticket.__new__(Ticket)
+            for f, cat, text in columns:
+                if cat is not None:
+                    code = cat[0][i]
+                    if code >= 0:
+                        setattr(ticket, f, cat[1][code])
+                    continue
+                offsets, states, data = text
+                state = states[i]
+                if state == _TEXT_STR:
+                    setattr(ticket, f, str(data[offsets[i]:offsets[i + 1]], "utf-8"))
+                elif state == _TEXT_NONE:
+                    setattr(ticket, f, None)
+                elif state == _TEXT_JSON:
+                    setattr(ticket, f, json.loads(str(data[offsets[i]:offsets[i + 1]], "utf-8")))
+            yield ticket
+
+    def close(self):
+        # memoryviews into the mapping must be released before it can be closed
+        self._categorical = {}
+        self._text = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def _restamp_snapshot(snapshot_path, st):
+    """Record the export's current mtime in the snapshot header, in place.
+
+    Keeps the next run on the stat fast path after a content-hash match.
+    Returns False (snapshot untouched) when the new header would not fit.
+    """
+    with open(snapshot_path, "r+b") as f:
+        f.seek(len(_SNAPSHOT_MAGIC))
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        header["source"]["mtime_ns"] = st.st_mtime_ns
+        data = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(data) > header_len:
+            return False
+        f.seek(len(_SNAPSHOT_MAGIC) + 8)
+        f.write(data + b" " * (header_len - len(data)))
+    return True
+
+
+def open_jira_snapshot(source=JIRA_EXPORT, snapshot_path=JIRA_SNAPSHOT):
+    """Return a JiraSnapshot for the current export, (re)building it if needed.
+
+    The snapshot is reused when the export's size and mtime match; if only the
+    stat changed (copied or touched file), the content hash decides.
+    """
+    st = source.stat()
+    snapshot = None
+    if snapshot_path.exists():
+        try:
+            snapshot = JiraSnapshot(snapshot_path)
+        except (ValueError, OSError) as e:
+            print(f"  Warning: ignoring unreadable snapshot {snapshot_path.name}: {e}")
+    sha256 = None
+    if snapshot is not None:
+        src = snapshot.source
+        if src["size"] == st.st_size and src["mtime_ns"] == st.st_mtime_ns:
+            return snapshot
+        if src["size"] == st.st_size:
+            sha256 = _sha256_file(source)
+            if sha256 == src["sha256"] and _restamp_snapshot(snapshot_path, st):
+                src["mtime_ns"] = st.st_mtime_ns
+                return snapshot
+        snapshot.close()
+    print(f"  Building ticket snapshot from {source.name}...")
+    build_jira_snapshot(source, snapshot_path, sha256=sha256)
+    return JiraSnapshot(snapshot_path)
+
+
+def load_tickets(use_cache=True):
+    """Ticket records for analysis: from the snapshot cache, or streamed from the export."""
+    if not use_cache:
+        return [Ticket.from_issue(issue) for issue in iter_jira()]
+    snapshot = open_jira_snapshot()
+    try:
+        return list(snapshot)
+    finally:
+        snapshot.close()
 
 def load_services():
     """Load services from Coda CSV + hardcoded catalog for services missing from CSV."""
@@ -160,20 +596,14 @@ def load_roles():
 
 def fetch_spaces():
     """Fetch non-archived Spaces from Coda Workspace HQ including Go2Guys."""
-    url = (
-        f"https://coda.io/apis/v1/docs/{CODA_DOC_ID}/tables/{CODA_SPACES_TABLE_ID}"
-        f"/rows?limit=200&valueFormat=simple"
-    )
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {CODA_API_KEY}"})
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
+        items = _coda_fetch_all(CODA_SPACES_TABLE_ID)
     except Exception as e:
         print(f"  Warning: Could not fetch Spaces from Coda: {e}")
         return []
 
     spaces = []
-    for row in data.get("items", []):
+    for row in items:
         v = row["values"]
         if v.get("c-0efCNijGar", False):   # Archived
             continue
@@ -187,25 +617,497 @@ def fetch_spaces():
     return spaces
 
 
-def _coda_fetch_all(table_id):
-    """Fetch all rows from a Coda table (handles pagination)."""
-    items = []
+# ── Coda Fetch ──
+#
+# main() prefetches every Coda table it reads in a bounded thread pool before the
+# fetch_* functions run: one table per worker, its pages in order, so at most
+# CODA_MAX_CONCURRENT requests are in flight against the doc. Each table's rows
+# (or its exception) are parked in _coda_prefetched and handed to the next
+# _coda_fetch_all() for that table, so fetch_* keep their own error handling and
+# a failing or timed-out table only costs its own worker.
+#
+# All requests go through one shared CodaClient: keep-alive connections to the
+# API host are pooled and reused across pages and tables, so a sync pays one
+# TCP/TLS handshake per worker instead of one per page, and bodies come gzipped.
+#
+# main() gives the client a CodaMirror, a SQLite copy of every table it reads.
+# A table is synced incrementally: its rows are listed by updatedAt, newest
+# first, down to the newest updatedAt of the previous sync (the watermark), so a
+# sync costs pages in proportion to the rows changed since, not to the table.
+# The first of those pages is revalidated with its ETag (304 = nothing changed),
+# and within the TTL a table isn't asked for at all. Deleted rows don't show up
+# in that listing, so every CODA_FULL_SYNC_INTERVAL (and on the first sync) the
+# whole table is re-read instead and replaces the mirrored rows.
+#
+# Each sync is written in one transaction, so the mirror always holds the last
+# good state of a table, and a table whose request fails (timeout, reset) is
+# read from it. The first failure to connect opens the client's circuit breaker:
+# no further requests are sent and every table still to come is read from the
+# mirror at once, as with --offline.
+#
+# Every request first takes a token from the client's TokenBucket, sized so
+# that no CODA_RATE_LIMIT window can be exceeded however many workers fetch at
+# once. A 429 or transient 5xx is retried with jittered exponential backoff (a
+# 429's Retry-After pauses the whole bucket, not just the worker that got it),
+# so a page is asked for again with the same pageToken instead of the table
+# being restarted or dropped. When the retries run out, the mirror's last good
+# state of the table is read.
+
+CODA_MAX_CONCURRENT = 8
+CODA_TIMEOUT = 15  # seconds per request
+CODA_MIRROR = CACHE / "coda_mirror.sqlite"
+CODA_MIRROR_VERSION = 1
+CODA_CACHE_TTL = 600  # seconds a synced table is read from the mirror without asking Coda
+CODA_FULL_SYNC_INTERVAL = 24 * 3600  # seconds between full re-reads that pick up deleted rows
+CODA_RATE_LIMIT = (100, 6.0)  # Coda API: read requests per window of seconds
+CODA_BURST = 10
+CODA_RETRIES = 5
+CODA_BACKOFF = 0.5  # seconds before the first retry, doubled per retry (jittered)
+CODA_BACKOFF_MAX = 30.0  # also caps Retry-After
+CODA_RETRY_STATUSES = {429, 500, 502, 503, 504}
+CODA_TABLES = {  # table id → name, every table main() reads
+    CODA_SPACES_TABLE_ID: "db_Spaces",
+    CODA_CONTRACTS_TABLE_ID: "db_Contracts",
+    "grid-HodIxWdfXT": "db_Projects",
+    "grid-8jIH1k4XCY": "db_Tasks",
+    "grid-C22FG7clXy": "db_People",
+    "grid-8gjU0zgevl": "db_Meetings&Events",
+    "grid-yIMb_JBnKL": "db_Ressources",
+    "grid-h1F3M3aWDK": "db_Objectives",
+    "grid-Bo29mzLZUF": "db_Key_Results",
+    "grid-KIF2S6vtGp": "db_Deals",
+    "grid-daHpz4zhc0": "db_InternalTeams",
+}
+_coda_prefetched = {}
+
+
+class CodaUnavailable(Exception):
+    """A Coda request failed below HTTP, or wasn't sent (offline, circuit breaker open)."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: burst requests at once, then rate per second.
+
+    With rate = (limit - burst) / window, no window of that many seconds sees
+    more than limit requests.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate, self.burst = rate, burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until there is one; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                start = max(self.stamp, self.paused_until)  # nothing is earned during a pause
+                if now > start:
+                    self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+                    self.stamp = now
+                delay = self.paused_until - now
+                if delay <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hold every acquire() for seconds, then refill from empty at rate."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.stamp = self.paused_until
+            self.tokens = 0.0
+
+
+def _retry_after(headers):
+    """Seconds from a Retry-After header (delta seconds or HTTP date), None if absent or unparsable."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CodaMirror:
+    """SQLite mirror of Coda tables: rows in listing order plus per-table sync state.
+
+    Each thread gets its own connection; writes are one transaction per sync.
+    """
+
+    def __init__(self, path=CODA_MIRROR, ttl=CODA_CACHE_TTL, full_sync_interval=CODA_FULL_SYNC_INTERVAL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.full_sync_interval = full_sync_interval
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        if db.execute("PRAGMA user_version").fetchone()[0] != CODA_MIRROR_VERSION:
+            with db:
+                db.execute("DROP TABLE IF EXISTS rows")
+                db.execute("DROP TABLE IF EXISTS tables")
+        db.execute("PRAGMA journal_mode=WAL")
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS rows (table_id TEXT, row_id TEXT, seq INTEGER,"
+                       " updated_at TEXT, data TEXT, PRIMARY KEY (table_id, row_id))")
+            db.execute("CREATE INDEX IF NOT EXISTS rows_order ON rows (table_id, seq)")
+            db.execute("CREATE TABLE IF NOT EXISTS tables (table_id TEXT PRIMARY KEY, watermark TEXT,"
+                       " etag TEXT, synced_at REAL, full_synced_at REAL)")
+            db.execute(f"PRAGMA user_version = {CODA_MIRROR_VERSION}")
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+
+    def state(self, table_id):
+        """{watermark, etag, synced_at, full_synced_at} of the last sync, None if never synced."""
+        row = self._db().execute("SELECT watermark, etag, synced_at, full_synced_at FROM tables WHERE table_id = ?",
+                                 (table_id,)).fetchone()
+        return dict(zip(("watermark", "etag", "synced_at", "full_synced_at"), row)) if row else None
+
+    def fresh(self, state):
+        return time.time() - state["synced_at"] < self.ttl
+
+    def due_full_sync(self, state):
+        return state is None or time.time() - state["full_synced_at"] >= self.full_sync_interval
+
+    def rows(self, table_id):
+        return [json.loads(data) for data, in self._db().execute(
+            "SELECT data FROM rows WHERE table_id = ? ORDER BY seq", (table_id,))]
+
+    def replace(self, table_id, rows):
+        """Full sync: the table's rows become exactly rows (in order); returns the number deleted."""
+        db = self._db()
+        now = time.time()
+        with db:
+            old = {row_id for row_id, in db.execute("SELECT row_id FROM rows WHERE table_id = ?", (table_id,))}
+            db.execute("DELETE FROM rows WHERE table_id = ?", (table_id,))
+            db.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?)",
+                           [(table_id, _coda_row_id(row, n), n, row.get("updatedAt") or "",
+                             json.dumps(row, ensure_ascii=False)) for n, row in enumerate(rows)])
+            watermark = max((row.get("updatedAt") or "" for row in rows), default="")
+            db.execute("INSERT OR REPLACE INTO tables VALUES (?, ?, NULL, ?, ?)", (table_id, watermark, now, now))
+        return len(old - {_coda_row_id(row, n) for n, row in enumerate(rows)})
+
+    def upsert(self, table_id, rows, etag):
+        """Incremental sync: update changed rows in place, append new ones in creation order.
+
+        Returns the number of rows that actually changed: rows updated at the
+        watermark itself are listed again by every sync. With none, only the
+        first page's ETag and the sync time move.
+        """
+        db = self._db()
+        with db:
+            before = db.total_changes
+            seq = db.execute("SELECT COALESCE(MAX(seq), -1) FROM rows WHERE table_id = ?", (table_id,)).fetchone()[0]
+            for row in sorted(rows, key=lambda row: row.get("createdAt") or ""):
+                seq += 1
+                db.execute("INSERT INTO rows VALUES (?, ?, ?, ?, ?) ON CONFLICT (table_id, row_id)"
+                           " DO UPDATE SET updated_at = excluded.updated_at, data = excluded.data"
+                           " WHERE data != excluded.data",
+                           (table_id, row["id"], seq, row.get("updatedAt") or "", json.dumps(row, ensure_ascii=False)))
+            changed = db.total_changes - before
+            db.execute("UPDATE tables SET watermark = MAX(watermark, ?), etag = ?, synced_at = ? WHERE table_id = ?",
+                       (max((row.get("updatedAt") or "" for row in rows), default=""), etag, time.time(), table_id))
+        return changed
+
+
+def _coda_row_id(row, n):
+    return row.get("id") or f"#{n}"
+
+
+class CodaClient:
+    """Keep-alive HTTP(S) client for the Coda API with a pool of idle connections.
+
+    Thread-safe: each request takes an idle connection (or opens one) and puts it
+    back afterwards. A reused connection the server has meanwhile closed is
+    retried once on a fresh one. Failing to open a connection, or a timeout or
+    reset on one that did open, opens the circuit breaker (self.broken), after
+    which get() raises CodaUnavailable without touching the network, as it does
+    throughout in offline mode.
+
+    Requests are paced by a TokenBucket for rate_limit (None: unpaced) and 429s
+    and 5xx answers retried up to retries times.
+    """
+
+    def __init__(self, base=None, api_key=CODA_API_KEY, timeout=None, max_idle=CODA_MAX_CONCURRENT, ssl_context=None,
+                 mirror=None, offline=False, rate_limit=CODA_RATE_LIMIT, retries=CODA_RETRIES, backoff=CODA_BACKOFF):
+        self.base = base or CODA_API
+        parts = urlsplit(self.base)
+        self.https = parts.scheme == "https"
+        self.host, self.port = parts.hostname, parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json",
+                        "Accept-Encoding": "gzip"}
+        self.timeout = CODA_TIMEOUT if timeout is None else timeout
+        self.max_idle = max_idle
+        self.ssl_context = ssl_context
+        self.mirror = mirror
+        self.offline = offline
+        self.broken = None      # first connection failure
+        self.limiter = None
+        if rate_limit:
+            limit, window = rate_limit
+            burst = min(CODA_BURST, limit // 2)
+            self.limiter = TokenBucket((limit - burst) / window, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = Counter()  # requests, connections, bytes (on the wire), retries, throttled, paced (seconds);
+        #                         tables and rows per kind of sync
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @property
+    def unavailable(self):
+        return self.offline or self.broken is not None
+
+    def _connect(self):
+        with self._lock:
+            self.stats["connections"] += 1
+        if self.https:
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.connect()
+        except OSError as e:
+            self.broken = self.broken or e
+            raise CodaUnavailable(f"Coda unreachable: {e}") from e
+        return conn
+
+    def _request(self, path, headers):
+        """One GET on a pooled connection: (status, reason, response headers, decoded body)."""
+        fresh = False
+        while True:
+            conn = None
+            if not fresh:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            conn = conn or self._connect()
+            try:
+                conn.request("GET", self.prefix + path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except ConnectionError:
+                conn.close()
+                if not reused:
+                    raise
+                fresh = True  # idle keep-alive connection closed by the server
+                continue
+            except Exception:
+                conn.close()
+                raise
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["bytes"] += len(body)
+                if resp.will_close or len(self._idle) >= self.max_idle:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+            if resp.getheader("Content-Encoding", "").lower() == "gzip":
+                body = gzip.decompress(body)
+            return resp.status, resp.reason, resp.headers, body
+
+    def get(self, path, etag=None):
+        """GET base + path: (status, ETag, JSON body or None for 304).
+
+        Raises urllib.error.HTTPError on 4xx/5xx (after retrying 429 and 5xx) and
+        CodaUnavailable when offline or once a connection to Coda has failed.
+        """
+        headers = {**self.headers, "If-None-Match": etag} if etag else self.headers
+        for attempt in range(self.retries + 1):
+            if self.unavailable:
+                raise CodaUnavailable("offline" if self.offline else f"Coda unreachable: {self.broken}")
+            if self.limiter:
+                self.count("paced", self.limiter.acquire())
+            try:
+                status, reason, resp_headers, body = self._request(path, headers)
+            except OSError as e:  # timeout or reset on an open connection: as down as a failed connect
+                self.broken = self.broken or e
+                raise CodaUnavailable(f"Coda request failed: {e}") from e
+            except http.client.HTTPException as e:
+                raise CodaUnavailable(f"Coda request failed: {e}") from e
+            if status not in CODA_RETRY_STATUSES or attempt == self.retries:
+                break
+            backoff = min(CODA_BACKOFF_MAX, self.backoff * 2 ** attempt)
+            delay = _retry_after(resp_headers)
+            delay = min(CODA_BACKOFF_MAX, delay) if delay is not None else random.uniform(backoff / 2, backoff)
+            self.count("retries")
+            if status == 429:
+                self.count("throttled")
+                if self.limiter:
+                    self.limiter.pause(delay)  # the next acquire() waits it out
+                    continue
+            time.sleep(delay)
+        if status == 304:
+            return status, etag, None
+        if status >= 400:
+            raise urllib.error.HTTPError(self.base + path, status, reason, resp_headers, None)
+        return status, resp_headers.get("ETag"), json.loads(body)
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_coda_client = None
+_coda_client_lock = threading.Lock()
+
+
+def coda_client():
+    """The shared CodaClient; rebuilt when CODA_API or CODA_TIMEOUT change."""
+    global _coda_client
+    with _coda_client_lock:
+        if _coda_client is None or (_coda_client.base, _coda_client.timeout) != (CODA_API, CODA_TIMEOUT):
+            if _coda_client is not None:
+                _coda_client.close()
+            _coda_client = CodaClient()
+        return _coda_client
+
+
+def configure_coda(cache_ttl=CODA_CACHE_TTL, offline=False, use_cache=True, full_sync=False):
+    """Install a shared CodaClient syncing into the SQLite mirror (or reading Coda directly) and return it."""
+    global _coda_client
+    mirror = None
+    if use_cache:
+        mirror = CodaMirror(CODA_MIRROR, cache_ttl, 0 if full_sync else CODA_FULL_SYNC_INTERVAL)
+    client = CodaClient(mirror=mirror, offline=offline)
+    with _coda_client_lock:
+        if _coda_client is not None:
+            _coda_client.close()
+        _coda_client = client
+    return client
+
+
+def _coda_pages(client, table_id, query="", etag=None):
+    """Yield (status, body) per page of a table's rows; a 304 for the first page (etag) ends it."""
     page_token = None
     while True:
-        url = (
-            f"https://coda.io/apis/v1/docs/{CODA_DOC_ID}/tables/{table_id}"
-            f"/rows?limit=200&valueFormat=simple"
-        )
+        path = f"/docs/{CODA_DOC_ID}/tables/{table_id}/rows?limit=200&valueFormat=simple{query}"
         if page_token:
-            url += f"&pageToken={page_token}"
-        req = urllib.request.Request(url, headers={"Authorization": f"Bearer {CODA_API_KEY}"})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read())
-        items.extend(data.get("items", []))
-        page_token = data.get("nextPageToken")
+            path += f"&pageToken={quote(page_token, safe='')}"
+        status, page_etag, data = client.get(path, etag if page_token is None else None)
+        client.count("pages")
+        yield status, page_etag, data
+        page_token = data.get("nextPageToken") if data else None
         if not page_token:
+            return
+
+
+def _coda_changed_rows(client, table_id, state):
+    """(rows updated since state's watermark, ETag of the first page); None if not listed newest first."""
+    changed, first_etag, previous = [], state["etag"], None
+    for n, (status, etag, data) in enumerate(_coda_pages(client, table_id, "&sortBy=updatedAt", state["etag"])):
+        if status == 304:
             break
-    return items
+        if n == 0:
+            first_etag = etag
+        for row in data.get("items", []):
+            updated = row.get("updatedAt") or ""
+            if previous is not None and updated > previous:
+                return None
+            previous = updated
+            if updated < state["watermark"]:
+                return changed, first_etag
+            changed.append(row)
+    return changed, first_etag
+
+
+def sync_coda_table(client, table_id):
+    """Bring the mirror of table_id up to date: a 304, an incremental or a full sync."""
+    mirror = client.mirror
+    state = mirror.state(table_id)
+    if not mirror.due_full_sync(state):
+        result = _coda_changed_rows(client, table_id, state)
+        if result is not None:
+            changed = mirror.upsert(table_id, *result)
+            client.count("incremental" if changed else "unchanged")
+            client.count("changed", changed)
+            return
+        print(f"  Warning: {CODA_TABLES.get(table_id, table_id)}: rows not listed by updatedAt, full sync")
+    rows = []
+    for _, _, data in _coda_pages(client, table_id):
+        rows.extend(data.get("items", []))
+    client.count("deleted", mirror.replace(table_id, rows))
+    client.count("full")
+
+
+def _coda_fetch_all(table_id):
+    """Fetch all rows from a Coda table (handles pagination).
+
+    A table fetched by prefetch_coda_tables() is served (or re-raised) from there once.
+    With a mirror the table is synced into it first and then read from it; if
+    the sync fails, or Coda is unavailable, the mirror's last good state is read.
+    """
+    if table_id in _coda_prefetched:
+        rows = _coda_prefetched.pop(table_id)
+        if isinstance(rows, Exception):
+            raise rows
+        return rows
+    client = coda_client()
+    mirror = client.mirror
+    if mirror is None:
+        rows = []
+        for _, _, data in _coda_pages(client, table_id):
+            rows.extend(data.get("items", []))
+        return rows
+    state = mirror.state(table_id)
+    if state and (client.unavailable or mirror.fresh(state)):
+        client.count("stale" if client.unavailable else "cached")
+        return mirror.rows(table_id)
+    try:
+        sync_coda_table(client, table_id)
+    except (CodaUnavailable, urllib.error.HTTPError) as e:
+        if isinstance(e, urllib.error.HTTPError) and e.code not in CODA_RETRY_STATUSES:
+            raise
+        if state is None:
+            raise CodaUnavailable(f"{e}; {CODA_TABLES.get(table_id, table_id)} was never synced") from e
+        if not client.broken:
+            print(f"  Warning: {CODA_TABLES.get(table_id, table_id)}: {e}, using the mirror")
+        client.count("stale")
+    return mirror.rows(table_id)
+
+
+def prefetch_coda_tables(table_ids, max_workers=CODA_MAX_CONCURRENT):
+    """Fetch Coda tables in parallel for the following _coda_fetch_all() calls.
+
+    Returns {table_id: (seconds, error or None)} in the order of table_ids.
+    """
+    def fetch(table_id):
+        t0 = time.perf_counter()
+        try:
+            rows = _coda_fetch_all(table_id)
+        except Exception as e:
+            rows = e
+        return rows, time.perf_counter() - t0
+
+    timings = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for table_id, (rows, seconds) in zip(table_ids, pool.map(fetch, table_ids)):
+            _coda_prefetched[table_id] = rows
+            timings[table_id] = (seconds, rows if isinstance(rows, Exception) else None)
+    return timings
 
 
 def _parse_eur(raw):
@@ -236,6 +1138,204 @@ def _norm_org(name):
     return re.sub(r'[^a-z0-9]', '', name.lower())
 
 
+class OrgIndex:
+    """Prefix trie over normalized org names (_norm_org keys).
+
+    Built once from (key, value) pairs in priority order. related(q) returns the
+    value of the first pair whose key equals q, is a prefix of q or has q as a
+    prefix — what a linear scan with startswith() in both directions returns —
+    in O(len(q)): keys that are prefixes of q lie on q's path, keys extending q
+    lie in the subtree where the path ends.
+    """
+
+    # Trie node: [children by char, first rank ending here, smallest rank in subtree]
+    def __init__(self, items=()):
+        self._values = []
+        self._root = [{}, None, None]
+        for rank, (key, value) in enumerate(items):
+            self._values.append(value)
+            node = self._root
+            for ch in key:
+                if node[2] is None:
+                    node[2] = rank
+                node = node[0].setdefault(ch, [{}, None, None])
+            if node[2] is None:
+                node[2] = rank
+            if node[1] is None:
+                node[1] = rank
+
+    def __len__(self):
+        return len(self._values)
+
+    def related(self, query, default=None):
+        node = self._root
+        best = node[1]  # an empty key is a prefix of everything
+        for ch in query:
+            node = node[0].get(ch)
+            if node is None:
+                break
+            if node[1] is not None and (best is None or node[1] < best):
+                best = node[1]
+        else:
+            if node[2] is not None and (best is None or node[2] < best):
+                best = node[2]
+        return default if best is None else self._values[best]
+
+
+class NgramIndex:
+    """Character trigram index over normalized names for substring lookups.
+
+    matches(q) returns every indexed name n with q in n or n in q, in insertion
+    order. Only names sharing a trigram with q are verified: n in q requires all
+    of n's trigrams to occur in q, q in n all of q's. Names (and queries) shorter
+    than a trigram are checked directly.
+    """
+
+    N = 3
+
+    def __init__(self, names=()):
+        self._names = list(dict.fromkeys(names))
+        self._postings = defaultdict(list)  # trigram → name ids
+        self._gram_counts = []
+        self._short = []
+        for i, name in enumerate(self._names):
+            grams = self._grams(name)
+            self._gram_counts.append(len(grams))
+            if not grams:
+                self._short.append(i)
+            for g in grams:
+                self._postings[g].append(i)
+
+    def __len__(self):
+        return len(self._names)
+
+    @classmethod
+    def _grams(cls, s):
+        return {s[i:i + cls.N] for i in range(len(s) - cls.N + 1)}
+
+    def matches(self, query):
+        names = self._names
+        grams = self._grams(query)
+        if not grams:
+            return [n for n in names if query in n or n in query]
+        shared = Counter()
+        for g in grams:
+            for i in self._postings.get(g, ()):
+                shared[i] += 1
+        found = [i for i, c in shared.items()
+                 if (c == self._gram_counts[i] and names[i] in query)
+                 or (c == len(grams) and query in names[i])]
+        found += [i for i in self._short if names[i] in query]
+        return [names[i] for i in sorted(found)]
+
+
+# ── Entity Resolution ──
+#
+# Jira names (customer prefixes, assignees) and Coda entities (contract and deal
+# orgs, people) are linked by normalized-name matching. Results are kept in a
+# resolution table next to the outputs, one section per kind of link, so a run
+# only resolves names it has not seen before. A section is keyed by a
+# fingerprint of its ordered target keys and re-resolved when they change.
+
+ENTITY_TABLE = APP / "public" / "entity_resolution.json"
+ENTITY_TABLE_VERSION = 1  # bump when the resolution rules change
+
+RESOLUTION_STATS = {"cached": 0, "resolved": 0}
+
+
+def load_entity_table(path=ENTITY_TABLE):
+    """Persisted {kind: {"targets": fingerprint, "entries": {name: entry}}}; empty if missing or stale."""
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"  Warning: ignoring unreadable resolution table {path.name}: {e}")
+        return {}
+    if raw.get("version") != ENTITY_TABLE_VERSION:
+        return {}
+    return raw.get("kinds", {})
+
+
+def save_entity_table(table, path=ENTITY_TABLE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": ENTITY_TABLE_VERSION, "kinds": table}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def resolution_entry(query, key, jira, coda):
+    """Table entry for a normalized query that matched the normalized key (None: no match).
+
+    method: exact, prefix (one name starts the other), substring or none;
+    confidence: length of the shorter name over the longer one.
+    """
+    if key is None:
+        return {"jira": jira, "coda": coda, "key": None, "method": "none", "confidence": 0.0}
+    if query == key:
+        method = "exact"
+    elif query.startswith(key) or key.startswith(query):
+        method = "prefix"
+    else:
+        method = "substring"
+    confidence = round(min(len(query), len(key)) / max(len(query), len(key), 1), 2)
+    return {"jira": jira, "coda": coda, "key": key, "method": method,
+            "confidence": 1.0 if method == "exact" else confidence}
+
+
+def resolve_names(table, kind, names, targets, resolve):
+    """{name: entry} for names, reusing table[kind] while its targets are unchanged.
+
+    targets is the ordered list of keys resolve(name) matches against. Only names
+    missing from the section are resolved; names not seen this run are dropped.
+    """
+    fingerprint = hashlib.sha256(repr(list(targets)).encode("utf-8", "surrogatepass")).hexdigest()
+    section = table.get(kind)
+    known = section["entries"] if section and section.get("targets") == fingerprint else {}
+    entries = {}
+    for name in names:
+        if name in entries:
+            continue
+        if name in known:
+            entries[name] = known[name]
+            RESOLUTION_STATS["cached"] += 1
+        else:
+            entries[name] = resolve(name)
+            RESOLUTION_STATS["resolved"] += 1
+    table[kind] = {"targets": fingerprint, "entries": entries}
+    return entries
+
+
+def link_customers(table, orgs, customer_list):
+    """{org: customer or None} for Coda contract orgs, through table["customers"].
+
+    Cached entries are followed by their normalized key, not the Jira display
+    name they recorded: a customer renamed without changing its key (e.g. only
+    its casing) keeps its links, and the entry is updated to the current name.
+    """
+    customer_keys = [_norm_org(c["name"]) for c in customer_list]
+    customer_index = OrgIndex(zip(customer_keys, customer_list))
+    customers_by_key = {}
+    for key, c in zip(customer_keys, customer_list):
+        customers_by_key.setdefault(key, c)  # OrgIndex priority: first customer per key
+
+    def _resolve_org(org_name):
+        norm_org = _norm_org(org_name)
+        cust = customer_index.related(norm_org)
+        key = _norm_org(cust["name"]) if cust else None
+        return resolution_entry(norm_org, key, cust["name"] if cust else None, org_name)
+
+    links = {}
+    for org, entry in resolve_names(table, "customers", orgs, customer_keys, _resolve_org).items():
+        cust = customers_by_key[entry["key"]] if entry["key"] is not None else None
+        if cust is not None:
+            entry["jira"] = cust["name"]
+        links[org] = cust
+    return links
+
+
 def fetch_organizations():
     """Fetch non-archived organizations from Coda Workspace HQ."""
     try:
@@ -538,106 +1638,147 @@ def fetch_teams():
     return result
 
 
-def analyze_historic_roles(tickets, roles_list, matchers, spaces_list=None):
-    """For each Coda role, find who historically performed it based on Jira ticket patterns."""
+# ── Role Carrier Scoring ──
+#
+# Role signatures (scripts/role_signatures.json) name the services and projects
+# whose tickets show that a Jira assignee performed a Coda role. Carriers are
+# scored from one person × service / person × project count matrix, so each
+# additional signature costs a few column sums over the people axis.
+
+ROLE_SIGNATURES = Path(__file__).resolve().parent / "role_signatures.json"
+
+# field → (accepted types, default)
+ROLE_SIGNATURE_FIELDS = {
+    "services": (list, []),
+    "projects": (list, []),
+    "min_coverage": ((int, float), 0.10),
+    "min_tickets": (int, 20),
+    "min_role_tickets_abs": (int, 0),   # absolute role-ticket floor (filters incidental contributors)
+    "isms_filter": (bool, False),       # person needs isms_min ISMS-keyword tickets
+    "isms_min": (int, 0),
+    "isms_as_role_signal": (bool, False),  # ISMS ticket count replaces the project signal
+    "note": (str, ""),
+}
 
-    # Role signatures: map observable roles to their primary services/projects/types.
-    # Services without catalog unit rely on keywords - so we use actual service names from catalog.
-    ROLE_SERVICE_MAP = {
-        "Service Desk Agent (CuSe)": {
-            "services": ["Service Desk"],
-            "projects": [],
-            "min_coverage": 0.20,
-            "min_tickets": 100,
-        },
-        "Support Agent (2nd Level) (MS)": {
-            "services": [
-                "Managed Infrastruktur", "Managed Backup & DR", "Managed MS Exchange Server",
-                "Managed Firewall", "Managed Endpointsecurity", "Managed Networking (WLAN)",
-                "levigo AntiSpam", "Shared Firewall", "Managed Monitoring",
-                "Managed Bizzdesign Horizzon", "1Password operating", "Checkmk operating",
-                "Managed Microsoft 365", "managed Atlassian",
-            ],
-            "projects": ["SD", "SDMS"],
-            "min_coverage": 0.20,
-            "min_tickets": 30,
-        },
-        "Support Agent (2nd Level) (CP)": {
-            "services": [
-                "levigo vDC", "Housing", "levigo cloud.drive", "TaRZ",
-                "Managed Openshift", "levigo Webhosting", "levigo Internet-Services",
-                "managed.wireguard", "Secure Remote Browsing", "levigo/matrix Mail Server",
-            ],
-            "projects": ["IEO"],
-            "min_coverage": 0.05,
-            "min_tickets": 20,
-        },
-        "Operations Engineer (MS)": {
-            "services": [
-                "Managed Monitoring", "Managed Backup & DR", "Managed Infrastruktur",
-                "Checkmk operating", "1Password operating",
-            ],
-            "projects": [],
-            "min_coverage": 0.15,
-            "min_tickets": 30,
-        },
-        "Operations Engineer (CP)": {
-            "services": [
-                "levigo vDC", "Housing", "managed.wireguard", "TaRZ",
-                "Managed Openshift", "Secure Remote Browsing",
-            ],
-            "projects": ["IEO"],
-            "min_coverage": 0.12,         # Raised: CP must be significant focus
-            "min_role_tickets_abs": 30,   # Excludes incidental CP work
-            "min_tickets": 20,
-        },
-        "System Engineer (Senior) (EnCo)": {
-            "services": ["vCIO"],
-            "projects": ["SXPP"],
-            "min_coverage": 0.05,
-            "min_tickets": 20,
-            "min_role_tickets_abs": 50,  # Excludes AMs/GF who track SXPP projects
-        },
-        "System Engineer (Junior) (EnCo)": {
-            "services": ["vCIO"],
-            "projects": ["SXPP"],
-            "min_coverage": 0.03,
-            "min_tickets": 10,
-            "min_role_tickets_abs": 60,  # Excludes AMs/GF who track SXPP but do few tickets
-        },
-        "Senior Berater Informationssicherheit": {
-            # Use only ISMS-keyword tickets as the role signal (no SXPP project)
-            "services": ["Cyber Risiko Check (nach DIN Spec 27076)", "Managed Informationssicherheit (ISMS)"],
-            "projects": [],
-            "isms_filter": True,          # Only count ISMS-keyword tickets
-            "isms_min": 3,                # At least 3 ISMS tickets required
-            "isms_as_role_signal": True,  # Use ISMS ticket count as role signal, not SXPP
-            "min_coverage": 0.001,        # Very low: filtered by abs count instead
-            "min_role_tickets_abs": 3,    # At least 3 absolute ISMS tickets
-            "min_tickets": 20,
-        },
-        "Software Engineer (Senior) (EnCo)": {
-            "services": [],
-            "projects": ["IEO"],
-            "min_coverage": 0.30,
-            "min_tickets": 20,
-        },
-        "Administrator Interne IT": {
-            "services": ["Managed Microsoft 365", "managed Atlassian", "levigo AntiSpam"],
-            "projects": [],
-            "min_coverage": 0.05,
-            "min_tickets": 20,
-        },
-        "Operations Engineer": {  # generic alias for CP+MS
-            "services": [
-                "Managed Monitoring", "Managed Backup & DR", "levigo vDC",
-                "Housing", "Managed Infrastruktur",
-            ],
-            "projects": [],
-            "min_coverage": 0.10,
-            "min_tickets": 20,
-        },
-    }
+
+def load_role_signatures(path=ROLE_SIGNATURES, service_names=None):
+    """{role: signature} from the JSON config, with defaults filled in.
+
+    Raises ValueError on unknown fields, wrong types or out-of-range values;
+    service names missing from service_names (the catalog) only warn, since
+    the catalog changes independently.
+    """
+    with open(path) as f:
+        raw = json.load(f)
+    roles = raw.get("roles") if isinstance(raw, dict) else None
+    if not isinstance(roles, dict):
+        raise ValueError(f"{path.name}: expected an object with a \"roles\" mapping")
+    signatures = {}
+    for role, sig in roles.items():
+        where = f"{path.name}: role {role!r}"
+        if not isinstance(sig, dict):
+            raise ValueError(f"{where}: expected an object, got {type(sig).__name__}")
+        unknown = sorted(set(sig) - set(ROLE_SIGNATURE_FIELDS))
+        if unknown:
+            raise ValueError(f"{where}: unknown field(s) {', '.join(unknown)}")
+        entry = {}
+        for field, (types, default) in ROLE_SIGNATURE_FIELDS.items():
+            value = sig.get(field, default)
+            if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+                raise ValueError(f"{where}: {field} has type {type(value).__name__}")
+            if isinstance(value, list):
+                if not all(isinstance(v, str) for v in value):
+                    raise ValueError(f"{where}: {field} must list names")
+                value = list(dict.fromkeys(value))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and value < 0:
+                raise ValueError(f"{where}: {field} must not be negative")
+            entry[field] = value
+        if entry["min_coverage"] > 1:
+            raise ValueError(f"{where}: min_coverage is a fraction (0..1), got {entry['min_coverage']}")
+        if not (entry["services"] or entry["projects"] or entry["isms_as_role_signal"]):
+            raise ValueError(f"{where}: no services, projects or ISMS signal")
+        if service_names is not None:
+            missing = [s for s in entry["services"] if s not in service_names]
+            if missing:
+                print(f"  Warning: {where}: services not in the catalog: {', '.join(missing)}")
+        signatures[role] = entry
+    return signatures
+
+
+class PersonCounts:
+    """Person × service and person × project ticket counts.
+
+    people are ordered by total tickets, most first (Counter.most_common()
+    order); every service, project and the ISMS keyword count is a column: a
+    list of counts aligned with people. A role's signal is the element-wise
+    sum of its columns.
+    """
+
+    def __init__(self, tickets, assignments, exclude=(), keyword=None):
+        person_total = Counter()
+        by_service, by_project = defaultdict(Counter), defaultdict(Counter)
+        keyword_hits = Counter()
+        for t in tickets:
+            assignee = t.get("assignee", "")
+            if not assignee or assignee in exclude:
+                continue
+            person_total[assignee] += 1
+            svc = assignments[t["key"]]
+            if svc:
+                by_service[svc][assignee] += 1
+            proj = t.get("project", "")
+            if proj:
+                by_project[proj][assignee] += 1
+            if keyword is not None and keyword.search(t.get("summary", "")):
+                keyword_hits[assignee] += 1
+        ranked = person_total.most_common()
+        self.people = [p for p, _ in ranked]
+        self.total = [n for _, n in ranked]
+        self.services = {name: self._column(c) for name, c in by_service.items()}
+        self.projects = {name: self._column(c) for name, c in by_project.items()}
+        self.keyword = self._column(keyword_hits)
+
+    def _column(self, counter):
+        return [counter.get(p, 0) for p in self.people]
+
+    def signal(self, columns, names):
+        """Element-wise sum of the named columns (zeros for unknown names)."""
+        total = [0] * len(self.people)
+        for name in names:
+            column = columns.get(name)
+            if column is not None:
+                total = list(map(int.__add__, total, column))
+        return total
+
+
+def score_role_carriers(counts, sig):
+    """[(person index, role tickets, coverage)] of people matching a role signature, in people order."""
+    svc = counts.signal(counts.services, sig["services"])
+    other = counts.keyword if sig["isms_as_role_signal"] else counts.signal(counts.projects, sig["projects"])
+    isms_min = sig["isms_min"] if sig["isms_filter"] else 0
+    min_total, min_role_abs, min_coverage = sig["min_tickets"], sig["min_role_tickets_abs"], sig["min_coverage"]
+    carriers = []
+    for i, (total, s, o, isms) in enumerate(zip(counts.total, svc, other, counts.keyword)):
+        if total < min_total:
+            break  # people are sorted by total
+        if isms < isms_min:
+            continue
+        role_tix = s + o
+        if min_role_abs and role_tix < min_role_abs:
+            continue
+        coverage = role_tix / total
+        if coverage >= min_coverage:
+            carriers.append((i, role_tix, coverage))
+    return carriers
+
+
+def analyze_historic_roles(tickets, roles_list, assignments, spaces_list=None, signatures=None):
+    """For each Coda role, find who historically performed it based on Jira ticket patterns.
+
+    signatures: {role: signature} as returned by load_role_signatures() (default: the config file).
+    """
+    if signatures is None:
+        signatures = load_role_signatures()
 
     # Bot/system accounts to exclude from carrier analysis
     BOT_ACCOUNTS = {"Automation for Jira", "JIRA", "jira", "system", "System", "local-tecuser"}
@@ -678,26 +1819,8 @@ def analyze_historic_roles(tickets, roles_list, matchers, spaces_list=None):
         re.IGNORECASE,
     )
 
-    # Build per-person stats from all tickets
-    person_service_tix = defaultdict(Counter)
-    person_project_tix = defaultdict(Counter)
-    person_isms_tix = defaultdict(int)   # tickets with ISMS/security content
-    person_total = Counter()
-
-    for t in tickets:
-        assignee = t.get("assignee", "")
-        if not assignee or assignee in BOT_ACCOUNTS:
-            continue
-        person_total[assignee] += 1
-        svc = match_ticket(t, matchers)
-        if svc:
-            person_service_tix[assignee][svc] += 1
-        proj = t.get("project", "")
-        if proj:
-            person_project_tix[assignee][proj] += 1
-        summary = t.get("summary", "")
-        if ISMS_KEYWORDS.search(summary):
-            person_isms_tix[assignee] += 1
+    # Person × service / project counts from all tickets (ISMS keyword hits as an extra column)
+    counts = PersonCounts(tickets, assignments, exclude=BOT_ACCOUNTS, keyword=ISMS_KEYWORDS)
 
     def parse_occupants(besetzung_str):
         """Parse 'Name (40h), Name2 (20h)' → ['Name', 'Name2']"""
@@ -714,7 +1837,7 @@ def analyze_historic_roles(tickets, roles_list, matchers, spaces_list=None):
     result_roles = []
     for role_data in roles_list:
         role_name = role_data["role"]
-        sig = ROLE_SERVICE_MAP.get(role_name)
+        sig = signatures.get(role_name)
         current = parse_occupants(role_data["besetzung"])
 
         role_entry = {
@@ -729,73 +1852,43 @@ def analyze_historic_roles(tickets, roles_list, matchers, spaces_list=None):
         }
 
         if sig:
-            sig_services = set(sig.get("services", []))
-            sig_projects = set(sig.get("projects", []))
-            min_coverage = sig.get("min_coverage", 0.10)
-            min_total = sig.get("min_tickets", 20)
-            min_role_abs = sig.get("min_role_tickets_abs", 0)
+            sig_services, sig_projects = sig["services"], sig["projects"]
 
-            use_isms_filter = sig.get("isms_filter", False)
-            isms_min = sig.get("isms_min", 0)
-            isms_as_signal = sig.get("isms_as_role_signal", False)
+            # Coda Spaces relevant to the role (Go2Guy cross-reference)
+            relevant_spaces = {SERVICE_TO_SPACE[svc] for svc in sig_services if svc in SERVICE_TO_SPACE}
+            unit_space = UNIT_TO_SPACE.get(role_data["unit"])
+            if unit_space:
+                relevant_spaces.add(unit_space)
 
             carriers = []
-            for person, total in person_total.most_common():
-                if total < min_total:
-                    continue
-                # ISMS-specific filter: person must have minimum ISMS keyword tickets
-                if use_isms_filter and person_isms_tix.get(person, 0) < isms_min:
-                    continue
-                svc_tix = sum(person_service_tix[person].get(s, 0) for s in sig_services)
-                proj_tix = sum(person_project_tix[person].get(p, 0) for p in sig_projects)
-                # For ISMS role: use ISMS ticket count directly as the role signal
-                if isms_as_signal:
-                    role_tix = svc_tix + person_isms_tix.get(person, 0)
-                else:
-                    role_tix = svc_tix + proj_tix
-                # Absolute role ticket minimum (filters out incidental contributors)
-                if min_role_abs and role_tix < min_role_abs:
-                    continue
-                coverage = role_tix / total if total > 0 else 0
-                if coverage >= min_coverage:
-                    top_svcs = sorted(
-                        [(s, person_service_tix[person][s]) for s in sig_services
-                         if person_service_tix[person].get(s, 0) > 0],
-                        key=lambda x: -x[1]
-                    )[:5]
-                    top_projs = sorted(
-                        [(p, person_project_tix[person][p]) for p in sig_projects
-                         if person_project_tix[person].get(p, 0) > 0],
-                        key=lambda x: -x[1]
-                    )[:3]
-                    entry = {
-                        "name": person,
-                        "totalTickets": total,
-                        "roleTickets": role_tix,
-                        "coverage": round(coverage * 100, 1),
-                        "isCurrent": person in current,
-                        "topServices": [{"name": s, "count": c} for s, c in top_svcs],
-                        "topProjects": [{"name": p, "count": c} for p, c in top_projs],
-                    }
-                    if use_isms_filter:
-                        entry["ismsTickets"] = person_isms_tix.get(person, 0)
-                    # Coda Spaces Go2Guy cross-reference
-                    if spaces_list:
-                        relevant_spaces = set()
-                        for svc in sig_services:
-                            mapped = SERVICE_TO_SPACE.get(svc)
-                            if mapped:
-                                relevant_spaces.add(mapped)
-                        unit_space = UNIT_TO_SPACE.get(role_data["unit"])
-                        if unit_space:
-                            relevant_spaces.add(unit_space)
-                        go2guy_spaces = [
-                            s for s in person_spaces.get(person, [])
-                            if s in relevant_spaces
-                        ]
-                        if go2guy_spaces:
-                            entry["spacesGoTo"] = go2guy_spaces
-                    carriers.append(entry)
+            for i, role_tix, coverage in score_role_carriers(counts, sig):
+                person = counts.people[i]
+                top_svcs = sorted(
+                    [(s, counts.services[s][i]) for s in sig_services
+                     if s in counts.services and counts.services[s][i] > 0],
+                    key=lambda x: -x[1]
+                )[:5]
+                top_projs = sorted(
+                    [(p, counts.projects[p][i]) for p in sig_projects
+                     if p in counts.projects and counts.projects[p][i] > 0],
+                    key=lambda x: -x[1]
+                )[:3]
+                entry = {
+                    "name": person,
+                    "totalTickets": counts.total[i],
+                    "roleTickets": role_tix,
+                    "coverage": round(coverage * 100, 1),
+                    "isCurrent": person in current,
+                    "topServices": [{"name": s, "count": c} for s, c in top_svcs],
+                    "topProjects": [{"name": p, "count": c} for p, c in top_projs],
+                }
+                if sig["isms_filter"]:
+                    entry["ismsTickets"] = counts.keyword[i]
+                if spaces_list:
+                    go2guy_spaces = [s for s in person_spaces.get(person, []) if s in relevant_spaces]
+                    if go2guy_spaces:
+                        entry["spacesGoTo"] = go2guy_spaces
+                carriers.append(entry)
 
             # Sort by coverage × volume (cap volume at 5000 to avoid Peter Sturm dominating)
             carriers.sort(key=lambda x: -(x["coverage"] * min(x["totalTickets"], 5000)))
@@ -806,7 +1899,7 @@ def analyze_historic_roles(tickets, roles_list, matchers, spaces_list=None):
     return result_roles
 
 
-def build_unit_keyword_map(units_list, kf_list):
+def build_unit_keyword_map(units_list=None, kf_list=None):
     """Build keyword patterns per unit from Kernfunktionen + unit descriptions.
 
     Returns dict: unit_name → list of (keyword_regex, weight) tuples.
@@ -901,30 +1994,59 @@ def build_unit_keyword_map(units_list, kf_list):
     return unit_keywords
 
 
-def assign_service_to_unit_by_kernfunktion(service_name, service_tickets, unit_kw_map):
+class UnitKeywordCounter:
+    """Weighted unit keyword hits of a text: one sum per unit, in unit_kw_map order.
+
+    Only the keyword patterns whose required literal occurs in the folded text
+    (LiteralScanner, as in the prefilter engine) and those without an
+    extractable literal run findall().
+    """
+
+    def __init__(self, unit_kw_map):
+        self.units = list(unit_kw_map)
+        self.patterns = [(u, rx, weight) for u, patterns in enumerate(unit_kw_map.values())
+                         for rx, weight in patterns]
+        literals = [required_literals(rx) for _, rx, _ in self.patterns]
+        self._always = sum(1 << i for i, lits in enumerate(literals) if lits is None)
+        self._scanner = LiteralScanner({i: lits for i, lits in enumerate(literals) if lits})
+
+    def __call__(self, text):
+        hits = [0] * len(self.units)
+        candidates = self._scanner.scan(_fold(text)) | self._always
+        while candidates:
+            low = candidates & -candidates
+            u, rx, weight = self.patterns[low.bit_length() - 1]
+            hits[u] += len(rx.findall(text)) * weight
+            candidates ^= low
+        return hits
+
+
+def assign_service_to_unit_by_kernfunktion(service_name, service_tickets, unit_kw_map, ticket_hits=None):
     """Score a service against all units using Kernfunktionen keywords.
 
-    Analyzes ticket summaries to find the best-matching unit.
+    Analyzes the summaries of all the service's tickets to find the best-matching
+    unit. ticket_hits: {unit: weighted keyword hits summed over those summaries}
+    as accumulated by classify_tickets(); counted here when not given.
     Returns (best_unit, score, scores_dict) or (None, 0, {}).
     """
     if not service_tickets:
         return None, 0, {}
 
-    # Sample up to 300 ticket summaries for keyword matching
-    sample = service_tickets[:300]
-    text_blob = " ".join(t.get("summary", "") for t in sample)
-    # Service name contributes heavily (repeated for weight)
-    text_blob += (" " + service_name) * 5
+    counter = UnitKeywordCounter(unit_kw_map)
+    if ticket_hits is None:
+        totals = [0] * len(counter.units)
+        for t in service_tickets:
+            totals = list(map(int.__add__, totals, counter(t.get("summary", ""))))
+        ticket_hits = dict(zip(counter.units, totals))
+    # Service name contributes heavily (counted 5 times for weight)
+    name_hits = dict(zip(counter.units, counter(service_name)))
 
-    n_tickets = len(sample)
+    n_tickets = len(service_tickets)
     scores = {}
-    for unit_name, patterns in unit_kw_map.items():
-        score = 0
-        for pattern, weight in patterns:
-            hits = len(pattern.findall(text_blob))
-            score += hits * weight
+    for unit_name in unit_kw_map:
+        score = ticket_hits.get(unit_name, 0) + 5 * name_hits[unit_name]
         if score > 0:
-            # Normalize by sample size to get density score
+            # Normalize by ticket count to get density score
             scores[unit_name] = round(score / n_tickets * 100, 1)
 
     if not scores:
@@ -1285,10 +2407,394 @@ ALIASES = {
                                   r"Wartungsarbeiten.*(?:RETN|DECIX|Colt|NorthC|Core-Backbone)"],
 }
 
-def build_matchers(services):
+# ── Literal Prefilter ──
+# Most alias patterns contain a literal that any match must include ("veeam",
+# "check_mk:", "compellent", ...). The prefilter engine extracts those literals
+# once, scans the case-folded text with an Aho-Corasick automaton and only runs
+# the regexes whose literal occurs (plus the ones without an extractable literal).
+
+try:
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+_LITERAL = _sre_parse.LITERAL
+_IN = _sre_parse.IN
+_AT = _sre_parse.AT
+_SUBPATTERN = _sre_parse.SUBPATTERN
+_BRANCH = _sre_parse.BRANCH
+_ATOMIC_GROUP = getattr(_sre_parse, "ATOMIC_GROUP", None)
+_REPEATS = {_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT, getattr(_sre_parse, "POSSESSIVE_REPEAT", None)}
+
+MIN_PREFILTER_LITERAL = 2
+
+def _casefold_fixes():
+    """Translation table for IGNORECASE equivalences that str.lower() keeps apart.
+
+    re treats e.g. 'ſ' ~ 's' and 'ı' ~ 'i' as equal; map every such class onto
+    one member. 'İ'.lower() is 'i' + U+0307, so the combining dot is dropped.
+    """
+    try:
+        from re._casefix import _EXTRA_CASES
+    except ImportError:
+        _EXTRA_CASES = {}
+    table = {0x307: None}
+    for c, others in _EXTRA_CASES.items():
+        members = {chr(c), *map(chr, others)}
+        rep = min(members)
+        for m in members:
+            if m != rep:
+                table[ord(m)] = rep
+    return table
+
+_CASEFOLD_FIXES = _casefold_fixes()
+
+def _fold(text):
+    """Case-fold text so that IGNORECASE-equal strings fold to equal strings."""
+    text = text.lower()
+    if not text.isascii():
+        text = text.translate(_CASEFOLD_FIXES)
+    return text
+
+def _literal_candidates(items):
+    """Required literal sets for a parsed pattern: each is a set of folded strings
+    of which at least one must occur in any text the pattern matches."""
+    candidates, run = [], []
+
+    def flush():
+        if run:
+            candidates.append(frozenset([_fold("".join(run))]))
+            run.clear()
+
+    for op, av in items:
+        if op is _LITERAL:
+            run.append(chr(av))
+            continue
+        if op is _IN and all(o is _LITERAL for o, _ in av):
+            chars = {_fold(chr(a)) for _, a in av}
+            if len(chars) == 1:  # [Ss], [Zz]
+                run.append(chars.pop())
+                continue
+        if op is _AT:  # zero-width (\b, ^, $): the literal run continues
+            continue
+        flush()
+        if op is _SUBPATTERN:
+            candidates += _literal_candidates(av[-1])
+        elif op is _ATOMIC_GROUP:
+            candidates += _literal_candidates(av)
+        elif op in _REPEATS and av[0] >= 1:
+            candidates += _literal_candidates(av[2])
+        elif op is _BRANCH:
+            alternatives = [_best_literals(_literal_candidates(alt)) for alt in av[1]]
+            if all(alternatives):
+                candidates.append(frozenset().union(*alternatives))
+    flush()
+    return candidates
+
+def _best_literals(candidates):
+    """Most selective candidate: longest shortest alternative, then fewest alternatives."""
+    candidates = [c for c in candidates if min(map(len, c)) >= MIN_PREFILTER_LITERAL]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(map(len, c)), -len(c)))
+
+def required_literals(pattern):
+    """Folded literals one of which occurs in every match of pattern, or None."""
+    try:
+        parsed = _sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    return _best_literals(_literal_candidates(parsed))
+
+class LiteralScanner:
+    """Aho-Corasick automaton over folded literals.
+
+    scan(text) returns a bitmask of the owners (pattern indices) whose literal
+    occurs in text, in one pass over text regardless of how many literals there are.
+    """
+
+    def __init__(self, literals):
+        """literals: {owner index: iterable of folded literal strings}."""
+        goto, out = [{}], [0]
+        for owner, words in literals.items():
+            for word in words:
+                state = 0
+                for ch in word:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append(0)
+                    state = nxt
+                out[state] |= 1 << owner
+        # Breadth-first failure links. delta[s] holds the DFA transitions of s
+        # except those it shares with the root, which scan() falls back to.
+        fail = [0] * len(goto)
+        delta = [{} for _ in goto]
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                queue.append(nxt)
+        for state in queue:
+            f = fail[state]
+            out[state] |= out[f]
+            delta[state] = {**delta[f], **goto[state]} if f else dict(goto[state])
+        self._root = goto[0]
+        self._delta = delta
+        self._out = out
+
+    def scan(self, text):
+        delta, root, out = self._delta, self._root, self._out
+        state = hits = 0
+        for ch in text:
+            state = delta[state].get(ch) or root.get(ch, 0)
+            hits |= out[state]
+        return hits
+
+# ── RE2 Backend ──
+# Optional linear-time engine (the google-re2 or pyre2 package, both imported as
+# re2). A pattern is handed to RE2 only if it can be spelled in RE2 syntax with
+# exactly the matches Python's re gives it; lookarounds, backreferences, \b/\w
+# (ASCII-only in RE2) and friends stay on re.
+
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+# Python's Unicode \s, spelled out for RE2 (whose \s is ASCII-only)
+_RE2_SPACE = r"\t-\r\x{1C}-\x{20}\x{85}\x{A0}\x{1680}\x{2000}-\x{200A}\x{2028}\x{2029}\x{202F}\x{205F}\x{3000}"
+# Under IGNORECASE re also folds 'İ' and 'ı' onto i/I; RE2's simple case folding doesn't
+_RE2_DOTTED_I = "İı"
+_RE2_FLAGS = {re.IGNORECASE: "i", re.DOTALL: "s", re.MULTILINE: "m"}
+
+def re2_pattern(rx):
+    """RE2 spelling of compiled pattern rx with identical matches, or None."""
+    flags = rx.flags & ~re.UNICODE
+    if flags & ~(re.IGNORECASE | re.DOTALL | re.MULTILINE):
+        return None
+    ignorecase = bool(flags & re.IGNORECASE)
+    pattern = rx.pattern
+    out = ["(?" + "".join(f for flag, f in _RE2_FLAGS.items() if flags & flag) + ")"] if flags else []
+    class_start = None  # index of the open '[' while inside a character class
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            e = pattern[i + 1]
+            if e == "d":
+                out.append(r"\p{Nd}")
+            elif e == "s":
+                out.append(_RE2_SPACE if class_start is not None else f"[{_RE2_SPACE}]")
+            elif e == "D" and class_start is None:
+                out.append(r"\P{Nd}")
+            elif e == "S" and class_start is None:
+                out.append(f"[^{_RE2_SPACE}]")
+            elif e == "Z" and class_start is None:
+                out.append(r"\z")
+            elif e in "uU":
+                width = 4 if e == "u" else 8
+                out.append(f"\\x{{{pattern[i + 2:i + 2 + width]}}}")
+                i += width
+            elif e.isalnum() and e not in "Aafnrtvx":  # \b \w \1 \N{...}: no exact RE2 equivalent
+                return None
+            else:
+                out.append(c + e)
+            i += 2
+            continue
+        if class_start is not None:
+            if c == "]":
+                if ignorecase:
+                    cls = pattern[class_start:i + 1]
+                    negated = cls.startswith("[^")
+                    out += [ch for ch in _RE2_DOTTED_I if bool(re.fullmatch(cls, ch, rx.flags)) != negated]
+                out.append(c)
+                class_start = None
+            elif c == "[":
+                if pattern.startswith("[:", i):  # RE2 would read a POSIX class
+                    return None
+                out.append(r"\[")
+            else:
+                out.append(c)
+            i += 1
+            continue
+        if c == "[":
+            class_start = i
+            j = i + 1 + pattern.startswith("^", i + 1)
+            j += pattern.startswith("]", j)  # leading ']' is a literal
+            out.append(pattern[i:j])
+            i = j
+            continue
+        if c == "(" and pattern.startswith("(?", i):
+            if pattern.startswith("(?P<", i):
+                end = pattern.index(">", i)
+                out.append(pattern[i:end + 1])
+                i = end + 1
+                continue
+            if not pattern.startswith("(?:", i):  # lookarounds, inline flags, atomic groups
+                return None
+        if c == "$":  # re's $ also matches before a trailing newline
+            return None
+        if c in "*+?}" and pattern.startswith("+", i + 1):  # possessive quantifier
+            return None
+        if c == "{" and pattern.startswith("{,", i):  # re reads {,n} as a repeat, RE2 as a literal
+            return None
+        if ignorecase and c in "iI":
+            out.append(f"[iI{_RE2_DOTTED_I}]")
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+def re2_compile(rx):
+    """RE2 regex equivalent to rx, or None if re2 isn't installed or can't express it."""
+    if _re2 is None:
+        return None
+    translated = re2_pattern(rx)
+    if translated is None:
+        return None
+    try:
+        return _re2.compile(translated)
+    except Exception:  # RE2-specific limits (e.g. repeat counts > 1000); the bindings differ in error type
+        return None
+
+MATCH_ENGINES = ("sequential", "prefilter", "re2")
+
+class PatternSet:
+    """Priority-ordered (service, regex) catalog with first-match-wins lookup.
+
+    first(text) returns the service of the first pattern (in catalog order) that
+    occurs anywhere in text. Engines give identical answers:
+      sequential  one search() per pattern until one hits (reference)
+      prefilter   a LiteralScanner pass over the folded text selects the patterns
+                  whose required literal occurs; only those (and the patterns
+                  without one) are searched, still in catalog order
+      re2         like sequential, but every pattern re2_compile() can express
+                  runs on RE2 (linear time); the rest stay on re
+    Every engine runs each pattern as compiled on its own, so backreferences
+    and named groups keep their meaning.
+    An optional window (e.g. a DescriptionWindow) trims text before matching.
+
+    With profile=True, first() instead searches every pattern (not just up to
+    the winner) and accumulates [evaluations, hits, wins, ns] per pattern in
+    self.profile; the answer is the same as the sequential engine's.
+    """
+
+    def __init__(self, matchers, engine="sequential", window=None, profile=False):
+        if engine not in MATCH_ENGINES:
+            raise ValueError(f"Unknown match engine {engine!r} (expected one of {', '.join(MATCH_ENGINES)})")
+        self.matchers = list(matchers)
+        self.engine = engine
+        self.window = window
+        self.profile = [[0, 0, 0, 0] for _ in self.matchers] if profile else None
+        self._scanner = None
+        self._searchers = self.matchers
+        if engine == "re2":
+            self._searchers = [(name, re2_compile(rx) or rx) for name, rx in self.matchers]
+        elif engine == "prefilter":
+            literals = [required_literals(rx) for _, rx in self.matchers]
+            self._always = sum(1 << i for i, lits in enumerate(literals) if lits is None)
+            self._scanner = LiteralScanner({i: lits for i, lits in enumerate(literals) if lits})
+
+    def __iter__(self):
+        return iter(self.matchers)
+
+    def __len__(self):
+        return len(self.matchers)
+
+    def first(self, text):
+        if self.window is not None:
+            text = self.window(text)
+        if self.profile is not None:
+            return self._first_profiled(text)
+        if self._scanner is not None:
+            candidates = self._scanner.scan(_fold(text)) | self._always
+            while candidates:
+                lowest = candidates & -candidates
+                name, pattern = self.matchers[lowest.bit_length() - 1]
+                if pattern.search(text):
+                    return name
+                candidates ^= lowest
+            return None
+        for name, pattern in self._searchers:
+            if pattern.search(text):
+                return name
+        return None
+
+    def _first_profiled(self, text):
+        winner = None
+        clock = time.perf_counter_ns
+        for (name, pattern), stats in zip(self.matchers, self.profile):
+            t0 = clock()
+            hit = pattern.search(text)
+            stats[3] += clock() - t0
+            stats[0] += 1
+            if hit:
+                stats[1] += 1
+                if winner is None:
+                    winner = name
+                    stats[2] += 1
+        return winner
+
+# Where quoted mail threads, signatures and report footers start (line-anchored)
+DESC_FOOTER_MARKERS = re.compile(
+    r"^(?:--\s*$|_{5,}\s*$|-{3,}\s*(?:Original Message|Ursprüngliche Nachricht)"
+    r"|(?:Von|From):\s.*\n(?:Gesendet|Sent|An|To|Datum|Date):"
+    r"|Mit freundlichen Grüßen|Freundliche Grüße|Viele Grüße|Beste Grüße|Best regards|Kind regards)",
+    re.MULTILINE | re.IGNORECASE)
+_LAST_WHITESPACE = re.compile(r"\s\S*\Z")
+
+class DescriptionWindow:
+    """Which part of a description pass 2 of match_ticket() scans.
+
+    spec is "full" (default: the whole text), "<N>kb" (the first N×1024
+    characters, cut back to a whitespace so no word boundary is invented),
+    "footer" (the text before the first DESC_FOOTER_MARKERS hit), or both
+    joined with "+" (e.g. "4kb+footer").
+    """
+
+    def __init__(self, spec="full"):
+        self.spec = spec.strip().lower()
+        self.limit = None
+        self.footer = False
+        for part in self.spec.split("+"):
+            if part == "footer":
+                self.footer = True
+            elif re.fullmatch(r"\d+kb", part) and int(part[:-2]) > 0:
+                self.limit = int(part[:-2]) * 1024
+            elif self.spec != "full":
+                raise ValueError(f"Invalid description window {spec!r} (expected full, <N>kb, footer or <N>kb+footer)")
+
+    def __call__(self, text):
+        if self.footer:
+            m = DESC_FOOTER_MARKERS.search(text, 0, self.limit or len(text))
+            if m:
+                text = text[:m.start()]
+        if self.limit is not None and len(text) > self.limit:
+            cut = self.limit
+            if not text[cut].isspace():
+                # back to the last whitespace; a window that is one long token
+                # (base64, a URL) is cut hard rather than dropped
+                m = _LAST_WHITESPACE.search(text, 0, cut)
+                if m and m.start() > 0:
+                    cut = m.start()
+            text = text[:cut]
+        return text
+
+    def __repr__(self):
+        return f"DescriptionWindow({self.spec!r})"
+
+def build_matchers(services, engine="sequential", desc_window="full", profile=False):
     """Build regex matchers for service names with aliases.
 
-    Returns (summary_matchers, description_matchers) — two separate lists.
+    Returns (summary_matchers, description_matchers) — two PatternSets; the
+    description set scans the DescriptionWindow given by desc_window, and
+    profile=True turns on per-pattern instrumentation (see PatternSet).
     Most patterns only match against summary. Description matching is limited
     to high-specificity patterns that won't cause false positives from
     Backup report footers, email signatures, etc.
@@ -1332,7 +2838,9 @@ def build_matchers(services):
     # Sort by pattern length descending (longer/more specific patterns first)
     summary_matchers.sort(key=lambda x: -len(x[1].pattern))
     desc_matchers.sort(key=lambda x: -len(x[1].pattern))
-    return summary_matchers, desc_matchers
+    window = DescriptionWindow(desc_window)
+    return (PatternSet(summary_matchers, engine, profile=profile),
+            PatternSet(desc_matchers, engine, window=None if window.spec == "full" else window, profile=profile))
 
 def decode_mime_subject(s):
     """Decode MIME-encoded subjects like =?utf-8?Q?...?= or =?utf-8?B?...?="""
@@ -1358,6 +2866,9 @@ _SYSTEM_SUMMARY_PREFIXES = {"levigo-Mon", "Check_MK", "AUTO-GRAYLOG",
                              "IBM", "http", "https", "systems"}
 _ESX_PREFIX_RE = re.compile(r'^[a-z]-esx-\d+')
 
+# Matching instrumentation for the current run (reported by main())
+MATCH_STATS = Counter()
+
 def match_ticket(ticket, matchers):
     """Match a ticket to a service using two-pass strategy.
 
@@ -1366,6 +2877,7 @@ def match_ticket(ticket, matchers):
     This prevents false positives from backup report footers, email
     signatures, and ticket boilerplate that contain service keywords.
     """
+    MATCH_STATS["calls"] += 1
     summary_matchers, desc_matchers = matchers
     summary = ticket.get("summary", "")
     # Decode MIME-encoded subjects
@@ -1373,16 +2885,16 @@ def match_ticket(ticket, matchers):
         summary = decode_mime_subject(summary)
 
     # Pass 1: summary matching (all patterns)
-    for name, pattern in summary_matchers:
-        if pattern.search(summary):
-            return name
+    name = summary_matchers.first(summary)
+    if name:
+        return name
 
     # Pass 2: description matching (safe patterns only)
     desc = ticket.get("description", "") or ""
     if desc:
-        for name, pattern in desc_matchers:
-            if pattern.search(desc):
-                return name
+        name = desc_matchers.first(desc)
+        if name:
+            return name
 
     # Fallback 1: IEO project → Housing (RZ operations)
     if ticket.get("project") == "IEO":
@@ -1408,6 +2920,14 @@ def match_ticket(ticket, matchers):
 
     return None
 
+def assign_services(tickets, matchers):
+    """Classify every ticket once: ticket key → service name (None if unmatched).
+
+    All analysis stages read from this map instead of re-running match_ticket(),
+    so the regex catalog is walked exactly once per ticket per run.
+    """
+    return {t["key"]: match_ticket(t, matchers) for t in tickets}
+
 # ── Customer Extraction ──
 
 # Internal system prefixes (not real customers)
@@ -1431,17 +2951,553 @@ def extract_customer(ticket):
         return prefix
     return None
 
+# ── Match Cache ──
+#
+# Alert tickets (Check_MK, levigo-Mon, Veeam [Success]/[Failed], iDRAC, ...) repeat
+# byte-identical content. Classification is a pure function of (summary,
+# description, project, type) and the matcher catalog, so results are cached by a
+# content hash, deduplicated within a run and persisted across runs. The cache
+# file is keyed by a fingerprint of the catalog and discarded when it changes.
+
+MATCH_CACHE = CACHE / "match_cache.json"
+MATCH_CACHE_VERSION = 2  # bump when match_ticket(), extract_customer() or entry layout changes
+
+def matcher_fingerprint(matchers, unit_counter=None):
+    """Hash of the pattern catalog (engine-independent), the unit keywords and MATCH_CACHE_VERSION."""
+    h = hashlib.sha256(f"v{MATCH_CACHE_VERSION}".encode())
+    for pattern_set in matchers:
+        for name, rx in pattern_set:
+            h.update(repr((name, rx.pattern, rx.flags)).encode("utf-8", "surrogatepass"))
+        h.update(repr(pattern_set.window).encode() + b"\0")
+    if unit_counter is not None:
+        h.update(repr(unit_counter.units).encode("utf-8", "surrogatepass"))
+        for u, rx, weight in unit_counter.patterns:
+            h.update(repr((u, rx.pattern, rx.flags, weight)).encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+def match_cache_key(ticket):
+    """Content hash of the fields that decide a ticket's service and customer.
+
+    Only normalized where the outcome provably can't differ (missing vs. empty
+    description, project and type) — masking numbers or whitespace would change
+    what the alias regexes see.
+    """
+    content = (ticket.get("summary", ""), ticket.get("description", "") or "",
+               ticket.get("project") or "", ticket.get("type") or "")
+    return hashlib.blake2b(repr(content).encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+def load_match_cache(fingerprint, path=MATCH_CACHE):
+    """Persisted {content key: [service, customer, unit hits]}; empty if missing, stale or unreadable."""
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"  Warning: ignoring unreadable match cache {path.name}: {e}")
+        return {}
+    if raw.get("fingerprint") != fingerprint:
+        return {}
+    return raw.get("entries", {})
+
+def save_match_cache(entries, fingerprint, path=MATCH_CACHE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"fingerprint": fingerprint, "entries": entries}, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# ── Parallel Classification ──
+
+CLASSIFY_CHUNK = 1000  # tickets per worker task
+
+_worker_matchers = None
+_worker_unit_counter = None
+
+def _init_classify_worker(services, engine, desc_window):
+    """Pool initializer: build the matchers once per worker process."""
+    global _worker_matchers, _worker_unit_counter
+    _worker_matchers = build_matchers(services, engine, desc_window)
+    _worker_unit_counter = UnitKeywordCounter(build_unit_keyword_map())
+
+def _classify(t, matchers, unit_counter):
+    return match_ticket(t, matchers), extract_customer(t), unit_counter(t.get("summary", ""))
+
+def _classify_chunk(chunk):
+    calls = MATCH_STATS["calls"]
+    results = [_classify(t, _worker_matchers, _worker_unit_counter) for t in chunk]
+    return results, MATCH_STATS["calls"] - calls
+
+def classify_tickets(tickets, services, engine="prefilter", workers=1, use_cache=True, desc_window="full"):
+    """Match every ticket to a service, extract its customer prefix and count unit keywords.
+
+    Returns (assignments, customers, unit_hits): ticket key → service name /
+    customer (None if absent), and service → {unit: weighted Kernfunktion
+    keyword hits summed over the summaries of its tickets}. Each distinct
+    content (match_cache_key) is classified once; with use_cache, results are
+    read from and written back to MATCH_CACHE.
+    With workers > 1 the contents still to classify are split into chunks that
+    a process pool works on; pool.map() yields the chunks in order, so the
+    result is identical to the single-process run.
+    """
+    matchers = build_matchers(services, engine, desc_window)
+    unit_counter = UnitKeywordCounter(build_unit_keyword_map())
+    fingerprint = matcher_fingerprint(matchers, unit_counter)
+    cache = load_match_cache(fingerprint) if use_cache else {}
+    keys = [match_cache_key(t) for t in tickets]
+    pending = {}  # content key → first ticket with that content
+    for t, key in zip(tickets, keys):
+        if key in cache:
+            MATCH_STATS["cache_hits"] += 1
+        elif key in pending:
+            MATCH_STATS["cache_repeats"] += 1
+        else:
+            pending[key] = t
+    todo = list(pending.values())
+    if workers <= 1:
+        results = [_classify(t, matchers, unit_counter) for t in todo]
+    else:
+        chunks = [todo[i:i + CLASSIFY_CHUNK] for i in range(0, len(todo), CLASSIFY_CHUNK)]
+        results = []
+        with ProcessPoolExecutor(workers, initializer=_init_classify_worker,
+                                 initargs=(services, engine, desc_window)) as pool:
+            for chunk_results, calls in pool.map(_classify_chunk, chunks):
+                results += chunk_results
+                MATCH_STATS["calls"] += calls
+    cache.update(zip(pending, results))
+    if use_cache:
+        # Persist this export's contents only, so the file doesn't grow without bound
+        save_match_cache({key: cache[key] for key in dict.fromkeys(keys)}, fingerprint)
+    assignments, customers, totals = {}, {}, {}
+    for t, key in zip(tickets, keys):
+        svc, customers[t["key"]], hits = cache[key]
+        assignments[t["key"]] = svc
+        if svc and any(hits):
+            acc = totals.get(svc)
+            totals[svc] = list(map(int.__add__, acc, hits)) if acc else list(hits)
+    unit_hits = {svc: dict(zip(unit_counter.units, acc)) for svc, acc in totals.items()}
+    return assignments, customers, unit_hits
+
+# ── Pattern Profiling ──
+
+PATTERN_PROFILE_FIELDS = ("set", "index", "service", "pattern", "evaluations", "hits", "wins",
+                          "time_ms", "us_per_eval")
+
+def profile_patterns(tickets, services, desc_window="full"):
+    """Classify every ticket with instrumented matchers; one row per compiled pattern.
+
+    Every pattern is searched on every text its set sees, so hits counts all
+    matches and wins only the ones that decided the service (first in catalog
+    order). Rows are sorted by cumulative time, most expensive first.
+    """
+    matchers = build_matchers(services, "sequential", desc_window, profile=True)
+    for t in tickets:
+        match_ticket(t, matchers)
+    rows = []
+    for set_name, pattern_set in zip(("summary", "description"), matchers):
+        for index, ((name, rx), (evals, hits, wins, ns)) in enumerate(zip(pattern_set, pattern_set.profile)):
+            rows.append({"set": set_name, "index": index, "service": name, "pattern": rx.pattern,
+                         "evaluations": evals, "hits": hits, "wins": wins,
+                         "time_ms": round(ns / 1e6, 3),
+                         "us_per_eval": round(ns / 1e3 / evals, 3) if evals else 0})
+    rows.sort(key=lambda r: -r["time_ms"])
+    return rows
+
+def write_pattern_profile(rows, out_dir, tickets_count):
+    """Write pattern_profile.json and pattern_profile.csv into out_dir."""
+    json_path = out_dir / "pattern_profile.json"
+    with open(json_path, "w") as f:
+        json.dump({"meta": {"tickets": tickets_count, "patterns": len(rows),
+                            "generatedAt": datetime.now().isoformat(timespec="seconds")},
+                   "patterns": rows}, f, ensure_ascii=False, indent=1)
+    with open(out_dir / "pattern_profile.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PATTERN_PROFILE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return json_path
+
+# ── Ticket Frame ──
+#
+# Integer-coded categorical columns over the ticket list. analyze() computes its
+# breakdowns as group-bys over these (one C-level Counter pass over zipped code
+# arrays per breakdown) instead of one Python loop per Counter. Row order is
+# ticket order; view() selects and reorders rows, and every result keeps the
+# first-seen order of its keys, which the most_common() ties in the output rely on.
+
+_FRAME_MISSING = object()  # field absent from the ticket (decoded to a per-breakdown default)
+
+class TicketFrame:
+    """Categorical columns (service, customer, assignee, reporter, project, type,
+    status, priority, year, month) as array('i') codes into self.values[column].
+
+    Code -1 marks a row the column leaves out: unmatched (service), no customer,
+    no assignee/reporter, no created date (year, month). priority is already
+    normalized the way every breakdown uses it (falsy → "None").
+    """
+
+    def __init__(self, tickets=None, assignments=None, customers=None):
+        self.values, self.codes = {}, {}
+        if tickets is None:
+            return
+        # Ticket slots read via getattr (an unset slot is a field missing from the issue)
+        keys = [t.key for t in tickets]
+        created = [getattr(t, "created", "") for t in tickets]
+        self._add("service", map(assignments.__getitem__, keys), optional=True)
+        self._add("customer", map(customers.__getitem__, keys), optional=True)
+        self._add("assignee", (getattr(t, "assignee", None) or None for t in tickets), optional=True)
+        self._add("reporter", (getattr(t, "reporter", None) or None for t in tickets), optional=True)
+        for column in ("project", "type", "status"):
+            self._add(column, (getattr(t, column, _FRAME_MISSING) for t in tickets))
+        self._add("priority", (getattr(t, "priority", None) or "None" for t in tickets))
+        self._add("year", (c[:4] or None for c in created), optional=True)
+        self._add("month", (c[:7] or None for c in created), optional=True)
+
+    def _add(self, column, values, optional=False):
+        index = {}
+        if optional:
+            codes = array("i", [-1 if v is None else index.setdefault(v, len(index)) for v in values])
+        else:
+            codes = array("i", [index.setdefault(v, len(index)) for v in values])
+        self.values[column] = list(index)
+        self.codes[column] = codes
+
+    def __len__(self):
+        return len(next(iter(self.codes.values()), ()))
+
+    def view(self, rows):
+        """Frame over the given row indexes, in that order."""
+        sub = TicketFrame()
+        sub.values = self.values
+        sub.codes = {c: array("i", map(codes.__getitem__, rows)) for c, codes in self.codes.items()}
+        return sub
+
+    def group_rows(self, column):
+        """Value → row indexes, in first-seen order (rows the column leaves out are skipped)."""
+        values = self.values[column]
+        groups = defaultdict(list)
+        for i, code in enumerate(self.codes[column]):
+            if code >= 0:
+                groups[code].append(i)
+        return {values[code]: rows for code, rows in groups.items()}
+
+    def _decode(self, column, default):
+        return [default if v is _FRAME_MISSING else v for v in self.values[column]]
+
+    def counts(self, column, default=None):
+        """Counter of column values (absent fields count as default)."""
+        values = self._decode(column, default)
+        out = Counter()
+        for code, n in Counter(self.codes[column]).items():
+            if code >= 0:
+                out[values[code]] += n
+        return out
+
+    def group_counts(self, by, column, default=None):
+        """{value of by: Counter of column values}, both in first-seen order."""
+        groups, values = self.values[by], self._decode(column, default)
+        out = {}
+        for (g, code), n in Counter(zip(self.codes[by], self.codes[column])).items():
+            if g >= 0 and code >= 0:
+                counter = out.get(groups[g])
+                if counter is None:
+                    counter = out[groups[g]] = Counter()
+                counter[values[code]] += n
+        return out
+
+# ── Heavy Hitters ──
+#
+# Word and n-gram statistics over unmatched summaries run in bounded memory:
+# a Space-Saving summary per n-gram order tracks at most HEAVY_HITTER_CAPACITY
+# candidates, and a count-min sketch supplies the starting count of a newly
+# admitted n-gram instead of the evicted minimum + 1. While fewer distinct
+# n-grams than the capacity occur, counts (and most_common() tie order) are exact.
+
+HEAVY_HITTER_CAPACITY = 4096
+HEAVY_HITTER_EXAMPLES = 3       # ticket keys kept per tracked n-gram
+SKETCH_WIDTH = 1 << 14
+SKETCH_DEPTH = 4
+NGRAM_WORD = re.compile(r'[a-zA-ZäöüÄÖÜß]{3,}')
+
+STOPWORDS = Path(__file__).resolve().parent / "stopwords.txt"
+
+
+def load_stopwords(path=STOPWORDS):
+    """Lowercased words, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return {line.strip().lower() for line in f if line.strip() and not line.lstrip().startswith("#")}
+
+
+class CountMinSketch:
+    """Count-min sketch: per-item count upper bounds in SKETCH_DEPTH × SKETCH_WIDTH counters.
+
+    Rows are indexed by double hashing of CRC-32 and Adler-32, which unlike
+    hash() are stable across processes.
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width, self.depth = width, depth
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, item):
+        data = item.encode("utf-8", "surrogatepass")
+        h1, h2 = zlib.crc32(data), zlib.adler32(data) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item):
+        """Count one occurrence; returns the new estimate."""
+        estimate = None
+        for row, cell in zip(self._rows, self._cells(item)):
+            row[cell] += 1
+            if estimate is None or row[cell] < estimate:
+                estimate = row[cell]
+        return estimate
+
+    def estimate(self, item):
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(item)))
+
+
+class SpaceSaving:
+    """Top-k frequent items of a stream in bounded memory (Space-Saving).
+
+    At most `capacity` items are tracked as [count, error, first seen, examples].
+    An untracked item replaces the one with the smallest count and starts at the
+    sketch estimate (or that smallest count + 1 without a sketch). Either is an
+    upper bound on its true count; `error` is how much of the count may come
+    from before it was tracked, so count - error <= true count <= count.
+    """
+
+    def __init__(self, capacity=HEAVY_HITTER_CAPACITY, sketch=None, examples=HEAVY_HITTER_EXAMPLES):
+        self.capacity = capacity
+        self.sketch = sketch
+        self.examples = examples
+        self.total = 0
+        self._entries = {}
+        self._heap = []  # (count, seq, item); counts only grow, so stale keys are fixed on pop
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, item, example=None):
+        self.total += 1
+        estimate = self.sketch.add(item) if self.sketch is not None else None
+        entry = self._entries.get(item)
+        if entry is not None:
+            entry[0] += 1
+        else:
+            self._seq += 1
+            if len(self._entries) < self.capacity:
+                entry = self._entries[item] = [1, 0, self._seq, []]
+                heapq.heappush(self._heap, (1, self._seq, item))
+            else:
+                heap, entries = self._heap, self._entries
+                while True:
+                    count, seq, victim = heap[0]
+                    current = entries[victim][0]
+                    if current == count:
+                        break
+                    heapq.heapreplace(heap, (current, seq, victim))
+                del entries[victim]
+                count = count + 1 if estimate is None else estimate
+                entry = entries[item] = [count, count - 1, self._seq, []]
+                heapq.heapreplace(heap, (count, self._seq, item))
+        if example is not None and len(entry[3]) < self.examples and example not in entry[3]:
+            entry[3].append(example)
+
+    def top(self, k):
+        """[(item, count, error, examples)] by count, ties in first-seen order."""
+        ranked = sorted(self._entries.items(), key=lambda kv: (-kv[1][0], kv[1][2]))[:k]
+        return [(item, count, error, examples) for item, (count, error, _, examples) in ranked]
+
+
+def unmatched_ngrams(tickets, stopwords, capacity=HEAVY_HITTER_CAPACITY):
+    """{n: SpaceSaving} of unigrams, bigrams and trigrams in ticket summaries.
+
+    Words are runs of 3+ letters, lowercased. An n-gram counts when its first
+    and last word are content words (longer than 3 letters, not a stopword),
+    once per occurrence, with the ticket key as example.
+    """
+    counters = {n: SpaceSaving(capacity, CountMinSketch()) for n in (1, 2, 3)}
+    for t in tickets:
+        words = [w.lower() for w in NGRAM_WORD.findall(t.get("summary", ""))]
+        content = [len(w) > 3 and w not in stopwords for w in words]
+        for n, counter in counters.items():
+            for i in range(len(words) - n + 1):
+                if content[i] and content[i + n - 1]:
+                    counter.add(" ".join(words[i:i + n]), t["key"])
+    return counters
+
+
+# ── Unmatched Clustering ──
+#
+# Near-duplicate unmatched summaries are grouped by MinHash + LSH: each distinct
+# normalized summary gets a signature of MINHASH_PERMUTATIONS minima over its
+# character shingles under independent universal hashes (a·h + b) mod p,
+# signatures are bucketed per band, and a new bucket member is linked to every
+# cluster in the bucket whose representative's shingle set reaches
+# CLUSTER_SIMILARITY Jaccard similarity with its own. Every text is hashed once
+# and compared with one representative per cluster sharing a band with it, so
+# the stage scales with the number of tickets rather than pairs of tickets.
+
+SHINGLE_SIZE = 4
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16                  # 16 bands × 4 rows: pairs at 0.6 Jaccard share a bucket 89% of the time
+CLUSTER_SIMILARITY = 0.6
+CLUSTER_MIN_SIZE = 3
+ALIAS_MIN_COVERAGE = 0.8        # share of a cluster's texts the suggested literal must occur in
+
+_MINHASH_PRIME = (1 << 61) - 1  # Mersenne prime above the 32-bit shingle hashes
+_minhash_rng = random.Random("minhash")  # fixed seed: signatures are stable across runs
+_MINHASH_COEFFS = [(_minhash_rng.randrange(1, _MINHASH_PRIME), _minhash_rng.randrange(_MINHASH_PRIME))
+                   for _ in range(MINHASH_PERMUTATIONS)]
+_CLUSTER_NUMBER = re.compile(r'\d+')
+_CLUSTER_SPACE = re.compile(r'\s+')
+
+
+def _cluster_text(summary):
+    """Lowercased summary with digit runs masked and whitespace collapsed."""
+    text = _CLUSTER_SPACE.sub(" ", decode_mime_subject(summary).lower()).strip()
+    return _CLUSTER_NUMBER.sub("0", text)
+
+
+def _shingles(text):
+    """Hashed character shingles (the whole text if shorter than SHINGLE_SIZE)."""
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode("utf-8", "surrogatepass"))}
+    return {zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8", "surrogatepass"))
+            for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingles, rows=None):
+    """MinHash signature: per permutation, the minimum of (a·h + b) mod p over the shingle hashes.
+
+    rows is an optional dict caching each shingle hash's permuted values across
+    calls; summaries share most of their shingles, so most rows are reused.
+    """
+    if rows is None:
+        rows = {}
+    table = []
+    for h in shingles:
+        row = rows.get(h)
+        if row is None:
+            row = rows[h] = [(a * h + b) % _MINHASH_PRIME for a, b in _MINHASH_COEFFS]
+        table.append(row)
+    return tuple(map(min, zip(*table)))
+
+
+def lsh_clusters(texts, similarity=CLUSTER_SIMILARITY, bands=LSH_BANDS):
+    """Groups of indices into texts whose shingle sets are near-duplicates.
+
+    Union-find over verified links: an LSH bucket keeps one representative per
+    cluster among its members, and each new member is compared with all of them
+    (it becomes a representative itself when it joins none).
+    """
+    shingles = [_shingles(t) for t in texts]
+    rows = MINHASH_PERMUTATIONS // bands
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)  # (band, band signature) → representatives
+    permuted = {}
+    for i, sh in enumerate(shingles):
+        signature = minhash(sh, permuted)
+        for b in range(bands):
+            reps = buckets[b, signature[b * rows:(b + 1) * rows]]
+            kept, roots, joined = [], set(), False
+            for rep in reps:
+                root = find(rep)
+                if root in roots:  # clusters merged since: one representative is enough
+                    continue
+                roots.add(root)
+                kept.append(rep)
+                if root == find(i):
+                    joined = True
+                    continue
+                other = shingles[rep]
+                if len(sh & other) >= similarity * len(sh | other):
+                    parent[find(i)] = root
+                    joined = True
+            if not joined:
+                kept.append(i)
+            reps[:] = kept
+    groups = defaultdict(list)
+    for i in range(len(texts)):
+        groups[find(i)].append(i)
+    return list(groups.values())
+
+
+def _suggest_alias(texts, representative):
+    """Longest word span of the representative that occurs in ALIAS_MIN_COVERAGE of texts.
+
+    Spans with masked digits are skipped: they would not match the raw summary.
+    """
+    words = representative.split()
+    spans = sorted({" ".join(words[i:j]) for i in range(len(words)) for j in range(i + 1, len(words) + 1)},
+                   key=lambda span: (-len(span), span))
+    for span in spans:
+        if "0" in span or len(span) < MIN_PREFILTER_LITERAL + 2:
+            continue
+        covered = sum(1 for t in texts if span in t)
+        if covered >= ALIAS_MIN_COVERAGE * len(texts):
+            return span, round(covered / len(texts), 2)
+    return None, 0.0
+
+
+def cluster_unmatched(tickets, min_size=CLUSTER_MIN_SIZE, limit=30):
+    """Near-duplicate clusters of ticket summaries, largest first.
+
+    Each cluster: ticket count, distinct texts, representative summary (the
+    most frequent one), dominant project and assignee, a suggested alias
+    literal with the share of texts containing it, and example ticket keys.
+    """
+    by_text = defaultdict(list)
+    for t in tickets:
+        by_text[_cluster_text(t.get("summary", ""))].append(t)
+    texts = [text for text in by_text if text]
+    clusters = []
+    for group in lsh_clusters(texts):
+        members = [t for i in group for t in by_text[texts[i]]]
+        if len(members) < min_size:
+            continue
+        group_texts = [texts[i] for i in group]
+        rep_text = max(group_texts, key=lambda text: len(by_text[text]))
+        representative = by_text[rep_text][0]
+        projects = Counter(t.get("project") or "?" for t in members)
+        assignees = Counter(t.get("assignee") for t in members if t.get("assignee"))
+        alias, coverage = _suggest_alias(group_texts, rep_text)
+        clusters.append({
+            "size": len(members),
+            "distinctSummaries": len(group),
+            "representative": decode_mime_subject(representative.get("summary", "")),
+            "project": projects.most_common(1)[0][0],
+            "assignee": assignees.most_common(1)[0][0] if assignees else None,
+            "suggestedAlias": alias,
+            "aliasCoverage": coverage,
+            "examples": [t["key"] for t in members[:3]],
+        })
+    clusters.sort(key=lambda c: -c["size"])
+    return clusters[:limit]
+
+
 # ── Analysis ──
 
-def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_list=None, spaces_list=None, contracts_list=None, coda_data=None):
-    matchers = build_matchers(services)
+def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_list=None, spaces_list=None, contracts_list=None, coda_data=None, assignments=None, customers=None, entity_table=None, role_signatures=None, unit_hits=None, stopwords=None):
+    if assignments is None:
+        assignments = assign_services(tickets, build_matchers(services))
+    if customers is None:
+        customers = {t["key"]: extract_customer(t) for t in tickets}
     unit_kw_map = build_unit_keyword_map(units_list, kf_list)
 
-    # Match tickets
+    # Group tickets by their assigned service
     matched = defaultdict(list)
     unmatched = []
     for t in tickets:
-        svc = match_ticket(t, matchers)
+        svc = assignments[t["key"]]
         if svc:
             matched[svc].append(t)
         else:
@@ -1450,34 +3506,22 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     total_matched = sum(len(v) for v in matched.values())
 
     # ── Service profiles ──
+    frame = TicketFrame(tickets, assignments, customers)
+    # Matched tickets grouped by service (in first-match order), like iterating matched.values()
+    matched_frame = frame.view([i for rows in frame.group_rows("service").values() for i in rows])
+    by_service = {column: matched_frame.group_counts("service", column, default)
+                  for column, default in (("assignee", None), ("reporter", None), ("year", None), ("month", None),
+                                          ("type", "Unknown"), ("project", "?"), ("status", "Unknown"),
+                                          ("priority", None))}
     service_list = []
     for name, meta in services.items():
         tix = matched.get(name, [])
+        assignees, reporters, yearly, monthly, by_type, by_project, by_status, by_priority = (
+            counts.get(name, Counter()) for counts in by_service.values())
 
         # Assignee counts
-        assignees = Counter(t["assignee"] for t in tix if t.get("assignee"))
         top_assignees = [{"name": n, "count": c} for n, c in assignees.most_common(8)]
 
-        # Yearly
-        yearly = Counter()
-        for t in tix:
-            year = t.get("created", "")[:4]
-            if year:
-                yearly[year] += 1
-
-        # Monthly (for sparkline)
-        monthly = Counter()
-        for t in tix:
-            month = t.get("created", "")[:7]
-            if month:
-                monthly[month] += 1
-
-        # By type, project, status, priority
-        by_type = Counter(t.get("type", "Unknown") for t in tix)
-        by_project = Counter(t.get("project", "?") for t in tix)
-        by_status = Counter(t.get("status", "Unknown") for t in tix)
-        by_priority = Counter(t.get("priority") or "None" for t in tix)
-
         # Samples
         samples = [{"key": t["key"], "summary": t["summary"]} for t in tix[:5]]
 
@@ -1485,7 +3529,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
         sale = sales.get(name, {})
 
         # Incident rate
-        incidents = sum(1 for t in tix if t.get("type") == "Incident")
+        incidents = by_type.get("Incident", 0)
         incident_rate = round(incidents / len(tix) * 100, 1) if tix else 0
 
         # Avg tickets per month (active months only)
@@ -1493,7 +3537,6 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
         avg_monthly = round(len(tix) / active_months, 1) if active_months else 0
 
         # Reporter distribution (who creates tickets)
-        reporters = Counter(t["reporter"] for t in tix if t.get("reporter"))
         top_reporters = [{"name": n, "count": c} for n, c in reporters.most_common(5)]
 
         service_list.append({
@@ -1528,26 +3571,18 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     # ── Team profiles (enriched with Staff data) ──
     staff_lookup = {s["name"]: s for s in staff_list}
 
-    all_assignees = defaultdict(lambda: {"tickets": [], "services": Counter()})
-    for svc_name, tix in matched.items():
-        for t in tix:
-            a = t.get("assignee")
-            if a:
-                all_assignees[a]["tickets"].append(t)
-                all_assignees[a]["services"][svc_name] += 1
+    team_services = matched_frame.group_counts("assignee", "service")
+    team_sizes = matched_frame.counts("assignee")
+    all_assignees = {name: {"tickets": team_sizes[name], "services": svcs} for name, svcs in team_services.items()}
+    team_yearly = matched_frame.group_counts("assignee", "year")
+    team_monthly = matched_frame.group_counts("assignee", "month")
+    team_by_type = matched_frame.group_counts("assignee", "type", "Unknown")
 
     team_profiles = {}
     for name, data in all_assignees.items():
-        tix = data["tickets"]
-        yearly = Counter()
-        monthly = Counter()
-        for t in tix:
-            year = t.get("created", "")[:4]
-            month = t.get("created", "")[:7]
-            if year: yearly[year] += 1
-            if month: monthly[month] += 1
-
-        by_type = Counter(t.get("type", "Unknown") for t in tix)
+        yearly = team_yearly.get(name, Counter())
+        monthly = team_monthly.get(name, Counter())
+        by_type = team_by_type[name]
 
         top_services = [{"name": n, "count": c} for n, c in data["services"].most_common()]
 
@@ -1555,7 +3590,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
         staff_info = staff_lookup.get(name, {})
 
         team_profiles[name] = {
-            "totalTickets": len(tix),
+            "totalTickets": data["tickets"],
             "topServices": top_services,
             "yearlyTickets": dict(sorted(yearly.items())),
             "monthlyTickets": dict(sorted(monthly.items())),
@@ -1568,56 +3603,33 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
         }
 
     # ── Yearly trend (enriched with monthly) ──
-    yearly_trend = defaultdict(lambda: {"total": 0, "byType": Counter(), "byProject": Counter()})
-    monthly_trend = defaultdict(lambda: {"total": 0, "byType": Counter(), "byProject": Counter()})
+    def _trend(period):
+        totals = matched_frame.counts(period)
+        by_type = matched_frame.group_counts(period, "type", "Unknown")
+        by_project = matched_frame.group_counts(period, "project", "?")
+        return {p: {"total": totals[p], "byType": dict(by_type[p]), "byProject": dict(by_project[p])}
+                for p in sorted(totals)}
 
-    for svc_tix in matched.values():
-        for t in svc_tix:
-            year = t.get("created", "")[:4]
-            month = t.get("created", "")[:7]
-            typ = t.get("type", "Unknown")
-            proj = t.get("project", "?")
-            if year:
-                yearly_trend[year]["total"] += 1
-                yearly_trend[year]["byType"][typ] += 1
-                yearly_trend[year]["byProject"][proj] += 1
-            if month:
-                monthly_trend[month]["total"] += 1
-                monthly_trend[month]["byType"][typ] += 1
-                monthly_trend[month]["byProject"][proj] += 1
-
-    yearly_out = {}
-    for y in sorted(yearly_trend):
-        d = yearly_trend[y]
-        yearly_out[y] = {"total": d["total"], "byType": dict(d["byType"]), "byProject": dict(d["byProject"])}
-
-    monthly_out = {}
-    for m in sorted(monthly_trend):
-        d = monthly_trend[m]
-        monthly_out[m] = {"total": d["total"], "byType": dict(d["byType"]), "byProject": dict(d["byProject"])}
+    yearly_out = _trend("year")
+    monthly_out = _trend("month")
 
     # ── Unmatched analysis (enriched) ──
-    unmatched_by_type = Counter(t.get("type", "Unknown") for t in unmatched)
-    unmatched_by_project = Counter(t.get("project", "?") for t in unmatched)
-    unmatched_by_status = Counter(t.get("status", "Unknown") for t in unmatched)
-    unmatched_by_priority = Counter(t.get("priority") or "None" for t in unmatched)
-    unmatched_yearly = Counter(t.get("created", "")[:4] for t in unmatched if t.get("created"))
-    unmatched_monthly = Counter(t.get("created", "")[:7] for t in unmatched if t.get("created"))
+    unmatched_frame = frame.view([i for i, code in enumerate(frame.codes["service"]) if code < 0])
+    unmatched_by_type = unmatched_frame.counts("type", "Unknown")
+    unmatched_by_project = unmatched_frame.counts("project", "?")
+    unmatched_by_status = unmatched_frame.counts("status", "Unknown")
+    unmatched_by_priority = unmatched_frame.counts("priority")
+    unmatched_yearly = unmatched_frame.counts("year")
+    unmatched_monthly = unmatched_frame.counts("month")
 
     # Top unmatched assignees
-    unmatched_assignees = Counter(t.get("assignee") for t in unmatched if t.get("assignee"))
-
-    # Word frequency in unmatched summaries (for service discovery)
-    word_freq = Counter()
-    stop_words = {"für", "von", "und", "der", "die", "das", "auf", "vom", "des", "am", "im", "zu",
-                  "den", "in", "mit", "aus", "an", "bei", "nach", "über", "ein", "eine", "einem",
-                  "einen", "einer", "ist", "wird", "wurde", "werden", "hat", "als", "nicht", "oder"}
-    for t in unmatched:
-        words = re.findall(r'[a-zA-ZäöüÄÖÜß]{3,}', t.get("summary", ""))
-        for w in words:
-            wl = w.lower()
-            if wl not in stop_words and len(wl) > 3:
-                word_freq[wl] += 1
+    unmatched_assignees = unmatched_frame.counts("assignee")
+
+    # Word and n-gram heavy hitters in unmatched summaries (for service discovery)
+    ngrams = unmatched_ngrams(unmatched, load_stopwords() if stopwords is None else stopwords)
+
+    def _top_ngrams(n, k, field):
+        return [{field: g, "count": c, "examples": examples} for g, c, _, examples in ngrams[n].top(k)]
 
     # ── Category analysis ──
     categories = defaultdict(lambda: {"services": 0, "tickets": 0, "incidents": 0, "serviceNames": []})
@@ -1686,7 +3698,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
 
         # Always compute KF scores for transparency (use all tickets for scoring)
         best_unit, score, all_scores = assign_service_to_unit_by_kernfunktion(
-            svc_name, tix, unit_kw_map
+            svc_name, tix, unit_kw_map, None if unit_hits is None else unit_hits.get(svc_name, {})
         )
 
         # Catalog unit is authoritative if present
@@ -1757,36 +3769,21 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     # ── Customer analysis ──
     customer_tickets = defaultdict(list)
     for t in tickets:
-        cust = extract_customer(t)
+        cust = customers[t["key"]]
         if cust:
             customer_tickets[cust].append(t)
 
     # Build customer profiles (top 50 by ticket count)
+    by_customer = {column: frame.group_counts("customer", column, default)
+                   for column, default in (("year", None), ("month", None), ("type", "Unknown"),
+                                           ("status", "Unknown"), ("service", None), ("assignee", None))}
     customer_list = []
     for cust_name, tix in sorted(customer_tickets.items(), key=lambda x: -len(x[1])):
         if len(tix) < 3:  # skip customers with < 3 tickets
             continue
-        yearly = Counter()
-        monthly = Counter()
-        by_type = Counter()
-        by_status = Counter()
-        services_matched = Counter()
-        incidents = 0
-        for t in tix:
-            year = t.get("created", "")[:4]
-            month = t.get("created", "")[:7]
-            if year: yearly[year] += 1
-            if month: monthly[month] += 1
-            by_type[t.get("type", "Unknown")] += 1
-            by_status[t.get("status", "Unknown")] += 1
-            if t.get("type") == "Incident":
-                incidents += 1
-            svc = match_ticket(t, matchers)
-            if svc:
-                services_matched[svc] += 1
-
-        # Assignees for this customer
-        assignees = Counter(t.get("assignee") for t in tix if t.get("assignee"))
+        yearly, monthly, by_type, by_status, services_matched, assignees = (
+            counts.get(cust_name, Counter()) for counts in by_customer.values())
+        incidents = by_type.get("Incident", 0)
 
         # Active period
         years = sorted(yearly.keys())
@@ -1823,20 +3820,28 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
             if key:
                 coda_contract_lookup[key].append(c)
 
-    def _find_contract(jira_name: str):
-        """Return best-matching Coda contracts for a Jira customer prefix name."""
+    if entity_table is None:
+        entity_table = {}
+    coda_contract_index = OrgIndex((key, key) for key in coda_contract_lookup)
+
+    def _resolve_contract(jira_name: str):
+        """Best-matching Coda contract org for a Jira customer prefix name."""
         norm_jira = _norm_org(jira_name)
         # Exact match first
         if norm_jira in coda_contract_lookup:
-            return coda_contract_lookup[norm_jira]
-        # Prefix match: Coda name is prefix of Jira name (e.g. 'beck' → 'beck packautomaten')
-        for coda_norm, contracts in coda_contract_lookup.items():
-            if norm_jira.startswith(coda_norm) or coda_norm.startswith(norm_jira):
-                return contracts
-        return None
+            key = norm_jira
+        else:
+            # Prefix match: Coda name is prefix of Jira name (e.g. 'beck' → 'beck packautomaten')
+            key = coda_contract_index.related(norm_jira)
+        coda = coda_contract_lookup[key][0]["org"] if key is not None else None
+        return resolution_entry(norm_jira, key, jira_name, coda)
+
+    contract_links = resolve_names(entity_table, "contracts", [c["name"] for c in customer_list],
+                                   list(coda_contract_lookup), _resolve_contract)
 
     for c in customer_list:
-        matched_contracts = _find_contract(c["name"])
+        key = contract_links[c["name"]]["key"]
+        matched_contracts = coda_contract_lookup[key] if key is not None else None
         if matched_contracts:
             # Aggregate: sum monthly values, collect levels, parts
             total_monthly = sum(mc["monthlyValue"] or 0 for mc in matched_contracts)
@@ -1866,17 +3871,20 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
         if key:
             deal_lookup[key].append(deal)
 
-    def _find_deals(jira_name: str):
+    deal_index = OrgIndex((key, key) for key in deal_lookup)
+
+    def _resolve_deal(jira_name: str):
         norm_jira = _norm_org(jira_name)
-        if norm_jira in deal_lookup:
-            return deal_lookup[norm_jira]
-        for deal_norm, deals in deal_lookup.items():
-            if norm_jira.startswith(deal_norm) or deal_norm.startswith(norm_jira):
-                return deals
-        return None
+        key = norm_jira if norm_jira in deal_lookup else deal_index.related(norm_jira)
+        coda = deal_lookup[key][0].get("org") if key is not None else None
+        return resolution_entry(norm_jira, key, jira_name, coda)
+
+    deal_links = resolve_names(entity_table, "deals", [c["name"] for c in customer_list],
+                               list(deal_lookup), _resolve_deal)
 
     for c in customer_list:
-        matched_deals = _find_deals(c["name"])
+        key = deal_links[c["name"]]["key"]
+        matched_deals = deal_lookup[key] if key is not None else None
         if matched_deals:
             c["codaDeals"] = matched_deals
 
@@ -2163,17 +4171,8 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
                            for c, d in sorted(cat_summary.items(), key=lambda x: -x[1]["artikel"])]
 
     # ── Priority analysis ──
-    all_matched_tickets = []
-    for tix in matched.values():
-        all_matched_tickets.extend(tix)
-
-    priority_stats = Counter(t.get("priority") or "None" for t in all_matched_tickets)
-    blocker_tickets = [t for t in all_matched_tickets if t.get("priority") == "Blocker"]
-    blocker_by_service = Counter()
-    for t in blocker_tickets:
-        svc = match_ticket(t, matchers)
-        if svc:
-            blocker_by_service[svc] += 1
+    priority_stats = matched_frame.counts("priority")
+    blocker_by_service = matched_frame.group_counts("priority", "service").get("Blocker", Counter())
 
     # ── Methodology data ──
     # Collect signal documentation for transparency view
@@ -2362,12 +4361,15 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
             "yearlyTickets": dict(sorted(unmatched_yearly.items())),
             "monthlyTickets": dict(sorted(unmatched_monthly.items())),
             "topAssignees": [{"name": n, "count": c} for n, c in unmatched_assignees.most_common(15)],
-            "topWords": [{"word": w, "count": c} for w, c in word_freq.most_common(50)],
+            "topWords": _top_ngrams(1, 50, "word"),
+            "topBigrams": _top_ngrams(2, 30, "phrase"),
+            "topTrigrams": _top_ngrams(3, 30, "phrase"),
+            "clusters": cluster_unmatched(unmatched),
         },
         "priorities": {
             "distribution": dict(priority_stats.most_common()),
             "blockerByService": dict(blocker_by_service.most_common()),
-            "blockerCount": len(blocker_tickets),
+            "blockerCount": priority_stats.get("Blocker", 0),
         },
         "staff": staff_list,
         "customers": customer_list,
@@ -2381,13 +4383,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
 
     # ── Insights: cross-source gaps & contradictions ──
     # Build reverse lookup: contract org → customer
-    def _find_customer_for_org(org_name):
-        norm_o = _norm_org(org_name)
-        for c in customer_list:
-            norm_c = _norm_org(c["name"])
-            if norm_o == norm_c or norm_o.startswith(norm_c) or norm_c.startswith(norm_o):
-                return c
-        return None
+    org_customers = link_customers(entity_table, [con["org"] for con in sorted_contracts], customer_list)
 
     # Gap 1: High-activity customers without a contract
     no_contract_active = [
@@ -2402,7 +4398,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     # Gap 2: Active contracts with no/minimal Jira visibility
     contract_no_jira = []
     for con in sorted_contracts:
-        cust = _find_customer_for_org(con["org"])
+        cust = org_customers[con["org"]]
         jira_tickets = cust["tickets"] if cust else 0
         if jira_tickets < 5:
             contract_no_jira.append({
@@ -2418,7 +4414,7 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     over_usage = [
         {"org": con["org"], "level": con["level"], "avgUsage": con["avgUsage"],
          "monthlyValue": con["monthlyValue"], "parts": con["parts"],
-         "jiraTickets": (_find_customer_for_org(con["org"]) or {}).get("tickets", 0)}
+         "jiraTickets": (org_customers[con["org"]] or {}).get("tickets", 0)}
         for con in sorted_contracts
         if con.get("avgUsage") and con["avgUsage"] > 100
     ]
@@ -2435,23 +4431,33 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
     high_risk_no_contract.sort(key=lambda x: -x["incidentRate"])
 
     # Gap 5: Coda internal people vs Jira assignee coverage
-    jira_assignee_norms = set()
+    jira_assignees = {}  # normalized name → first Jira spelling
     for s in service_list:
         for a in s.get("topAssignees", []):
-            jira_assignee_norms.add(_norm_org(a["name"]))
+            jira_assignees.setdefault(_norm_org(a["name"]), a["name"])
     for tp_name in (team_profiles if isinstance(team_profiles, list) else team_profiles.keys()):
-        jira_assignee_norms.add(_norm_org(tp_name if isinstance(tp_name, str) else tp_name.get("name", "")))
+        tp_name = tp_name if isinstance(tp_name, str) else tp_name.get("name", "")
+        jira_assignees.setdefault(_norm_org(tp_name), tp_name)
+    assignee_keys = sorted(jira_assignees)
+    assignee_index = NgramIndex(assignee_keys)
+
+    def _resolve_person(coda_name):
+        """Jira assignee whose normalized name equals, contains or is contained in the Coda name."""
+        norm_p = _norm_org(coda_name)
+        hits = assignee_index.matches(norm_p)
+        key = max(hits, key=lambda n: (n == norm_p, min(len(n), len(norm_p)) / max(len(n), len(norm_p), 1)),
+                  default=None)
+        return resolution_entry(norm_p, key, jira_assignees.get(key), coda_name)
+
+    coda_staff = [p for p in (coda_data or {}).get("people", [])
+                  if p.get("type") == "intern" and not p.get("archived")]
+    person_links = resolve_names(entity_table, "people", [p["name"] for p in coda_staff],
+                                 assignee_keys, _resolve_person)
 
     coda_not_in_jira = []
-    for p in (coda_data or {}).get("people", []):
-        if p.get("type") == "intern" and not p.get("archived"):
-            norm_p = _norm_org(p["name"])
-            in_jira = any(
-                norm_p == n or norm_p in n or n in norm_p
-                for n in jira_assignee_norms
-            )
-            if not in_jira:
-                coda_not_in_jira.append({"name": p["name"], "team": p.get("team", ""), "email": p.get("email", "")})
+    for p in coda_staff:
+        if person_links[p["name"]]["key"] is None:
+            coda_not_in_jira.append({"name": p["name"], "team": p.get("team", ""), "email": p.get("email", "")})
 
     output["insights"] = {
         "noContractHighActivity": no_contract_active,
@@ -2485,17 +4491,142 @@ def analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_lis
 
     # ── Cross-references (Querbeziehungen) ──
     output["crossReferences"] = _build_cross_references(
-        tickets, matched, matchers, customer_tickets, service_list, all_assignees
+        tickets, matched, assignments, customer_tickets, service_list, all_assignees
     )
 
     # ── Historic Roles ──
     if roles_list:
-        output["historicRoles"] = analyze_historic_roles(tickets, roles_list, matchers, spaces_list=spaces_list)
+        output["historicRoles"] = analyze_historic_roles(tickets, roles_list, assignments, spaces_list=spaces_list,
+                                                         signatures=role_signatures)
 
     return output
 
 
-def _build_cross_references(tickets, matched, matchers, customer_tickets, service_list, all_assignees):
+# ── Sparse Incidence ──
+
+class Incidence:
+    """Sparse 0/1 matrix A of (row, column) pairs, e.g. customer × service.
+
+    Rows are kept as sets of column ids. pair_counts() is the product AᵀA: for
+    each column pair, the number of rows containing both. Sparse rows are
+    accumulated from every row's outer product (cost Σ deg(row)², independent
+    of how many column pairs never meet); when that exceeds one operation per
+    column pair, columns become row bitmasks and each pair is AND + popcount.
+    Columns are numbered in first-seen order unless `columns` fixes the order.
+    """
+
+    def __init__(self, pairs=(), columns=()):
+        self.columns = list(columns)
+        self._col_ids = {c: i for i, c in enumerate(self.columns)}
+        self._rows = {}
+        for row, col in pairs:
+            self.add(row, col)
+
+    def add(self, row, col):
+        i = self._col_ids.get(col)
+        if i is None:
+            i = self._col_ids[col] = len(self.columns)
+            self.columns.append(col)
+        self._rows.setdefault(row, set()).add(i)
+
+    def column_sizes(self):
+        sizes = [0] * len(self.columns)
+        for cols in self._rows.values():
+            for i in cols:
+                sizes[i] += 1
+        return sizes
+
+    def pair_counts(self):
+        """Counter {(i, j): rows containing both} over column ids i < j."""
+        counts = Counter()
+        n = len(self.columns)
+        if sum(len(cols) ** 2 for cols in self._rows.values()) <= n * n:
+            for cols in self._rows.values():
+                counts.update(combinations(sorted(cols), 2))
+            return counts
+        masks = [0] * n
+        for bit, cols in enumerate(self._rows.values()):
+            for i in cols:
+                masks[i] |= 1 << bit
+        for i in range(n):
+            mask = masks[i]
+            for j in range(i + 1, n):
+                shared = (mask & masks[j]).bit_count()
+                if shared:
+                    counts[i, j] = shared
+        return counts
+
+    def overlaps(self, min_shared=1):
+        """(column a, column b, shared, size a, size b, jaccard) per pair, in column order."""
+        sizes = self.column_sizes()
+        result = []
+        for (i, j), shared in sorted(self.pair_counts().items()):
+            if shared >= min_shared:
+                result.append((self.columns[i], self.columns[j], shared, sizes[i], sizes[j],
+                               shared / (sizes[i] + sizes[j] - shared)))
+        return result
+
+
+# ── Temporal Correlation ──
+
+MAX_CORRELATION_LAG = 3      # months a service may lead or trail another
+MIN_CORRELATION_MONTHS = 6   # shortest (overlapping) series a correlation is computed on
+
+
+def _month_range(first, last):
+    """Every "YYYY-MM" from first to last inclusive."""
+    y, m = int(first[:4]), int(first[5:7])
+    months = []
+    while (month := f"{y:04d}-{m:02d}") <= last:
+        months.append(month)
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+def lagged_correlations(rows, max_lag=MAX_CORRELATION_LAG, min_overlap=MIN_CORRELATION_MONTHS):
+    """Pearson r of every row pair at lags -max_lag..max_lag.
+
+    rows are equal-length count series (a service × month matrix). Returns
+    {(i, j): {lag: r}} for i < j; lag > 0 pairs rows[i][t] with rows[j][t + lag],
+    i.e. row i leads row j. Segment sums and sums of squares come from per-row
+    prefix sums, so each lag costs a single dot product per pair. Lags whose
+    overlap is shorter than min_overlap or has zero variance are left out.
+    """
+    n = len(rows[0]) if rows else 0
+    prefix = []
+    for row in rows:
+        sums, squares = [0], [0]
+        for v in row:
+            sums.append(sums[-1] + v)
+            squares.append(squares[-1] + v * v)
+        prefix.append((sums, squares))
+
+    def segment(i, start, stop):
+        sums, squares = prefix[i]
+        total = sums[stop] - sums[start]
+        return total, squares[stop] - squares[start] - total * total / (stop - start)
+
+    result = {}
+    for i in range(len(rows)):
+        for j in range(i + 1, len(rows)):
+            by_lag = {}
+            for lag in range(-max_lag, max_lag + 1):
+                size = n - abs(lag)
+                if size < min_overlap:
+                    continue
+                a0, b0 = max(0, -lag), max(0, lag)
+                sum_a, var_a = segment(i, a0, a0 + size)
+                sum_b, var_b = segment(j, b0, b0 + size)
+                if var_a <= 0 or var_b <= 0:
+                    continue
+                dot = sum(map(operator.mul, rows[i][a0:a0 + size], rows[j][b0:b0 + size]))
+                by_lag[lag] = (dot - sum_a * sum_b / size) / (var_a * var_b) ** 0.5
+            if by_lag:
+                result[i, j] = by_lag
+    return result
+
+
+def _build_cross_references(tickets, matched, assignments, customer_tickets, service_list, all_assignees):
     """Build logical cross-references between services, customers, and team members."""
 
     # 1. SERVICE CO-OCCURRENCE: Which services co-occur at the same customer?
@@ -2505,37 +4636,26 @@ def _build_cross_references(tickets, matched, matchers, customer_tickets, servic
 
     cust_svc_map = defaultdict(Counter)
     for t in tickets:
-        svc = match_ticket(t, matchers)
+        svc = assignments[t["key"]]
         m = customer_re.match(t.get("summary", ""))
         if m and svc:
             cust = m.group(1)
             if cust not in SYSTEM and len(cust) <= 25:
                 cust_svc_map[cust][svc] += 1
 
-    # Build co-occurrence matrix (top services only for size)
-    top_svcs = [s["name"] for s in service_list if s["tickets"] > 50][:20]
-    svc_cooccurrence = defaultdict(Counter)
-    for cust, svcs in cust_svc_map.items():
-        svc_list = [s for s in svcs if s in top_svcs]
-        for i in range(len(svc_list)):
-            for j in range(i + 1, len(svc_list)):
-                a, b = sorted([svc_list[i], svc_list[j]])
-                svc_cooccurrence[a][b] += 1
-                svc_cooccurrence[b][a] += 1
-
-    # Flatten to edge list
+    # Co-occurrence over the customer × service incidence (services with volume)
+    volume_svcs = {s["name"] for s in service_list if s["tickets"] > 50}
+    cust_svc = Incidence((cust, svc) for cust, svcs in cust_svc_map.items() for svc in svcs if svc in volume_svcs)
+
     cooccurrence_edges = []
-    seen = set()
-    for a, targets in svc_cooccurrence.items():
-        for b, count in targets.most_common():
-            pair = tuple(sorted([a, b]))
-            if pair not in seen and count >= 5:
-                seen.add(pair)
-                cooccurrence_edges.append({
-                    "source": pair[0],
-                    "target": pair[1],
-                    "customers": count,
-                })
+    for a, b, count, _, _, jaccard in cust_svc.overlaps(min_shared=5):
+        a, b = sorted([a, b])
+        cooccurrence_edges.append({
+            "source": a,
+            "target": b,
+            "customers": count,
+            "jaccard": round(jaccard, 3),
+        })
     cooccurrence_edges.sort(key=lambda x: -x["customers"])
 
     # 2. TEAM SERVICE OVERLAP: Which team members share services?
@@ -2545,23 +4665,21 @@ def _build_cross_references(tickets, matched, matchers, customer_tickets, servic
             if cnt >= 5:  # minimum 5 tickets in service
                 svc_teams[svc_name].add(name)
 
-    team_overlap = []
     svc_names_sorted = sorted(svc_teams.keys(), key=lambda x: -len(svc_teams[x]))
-    for i in range(len(svc_names_sorted)):
-        for j in range(i + 1, len(svc_names_sorted)):
-            a, b = svc_names_sorted[i], svc_names_sorted[j]
-            shared = svc_teams[a] & svc_teams[b]
-            if len(shared) >= 3:
-                team_overlap.append({
-                    "serviceA": a,
-                    "serviceB": b,
-                    "sharedMembers": len(shared),
-                    "membersA": len(svc_teams[a]),
-                    "membersB": len(svc_teams[b]),
-                    "overlapRatio": round(len(shared) / min(len(svc_teams[a]), len(svc_teams[b])), 2),
-                })
+    person_svc = Incidence(((name, svc) for svc in svc_names_sorted for name in svc_teams[svc]),
+                           columns=svc_names_sorted)
+    team_overlap = []
+    for a, b, shared, size_a, size_b, jaccard in person_svc.overlaps(min_shared=3):
+        team_overlap.append({
+            "serviceA": a,
+            "serviceB": b,
+            "sharedMembers": shared,
+            "membersA": size_a,
+            "membersB": size_b,
+            "overlapRatio": round(shared / min(size_a, size_b), 2),
+            "jaccard": round(jaccard, 3),
+        })
     team_overlap.sort(key=lambda x: -x["sharedMembers"])
-    team_overlap = team_overlap[:50]
 
     # 3. CUSTOMER SERVICE BREADTH: How many services does each customer use?
     customer_breadth = []
@@ -2585,35 +4703,40 @@ def _build_cross_references(tickets, matched, matchers, customer_tickets, servic
             if month:
                 svc_monthly[svc_name][month] += 1
 
-    # Calculate correlation between top service pairs (monthly patterns)
-    all_months = sorted(set(m for mc in svc_monthly.values() for m in mc))
+    # Correlate every service with enough volume over a contiguous month axis,
+    # at lag 0 and with one service leading the other by up to MAX_CORRELATION_LAG months
+    observed = sorted(set(m for mc in svc_monthly.values() for m in mc))
+    all_months = _month_range(observed[0], observed[-1]) if observed else []
+    corr_svc_names = [s["name"] for s in service_list if s["tickets"] > 100]
+    svc_matrix = [[float(svc_monthly[name].get(m, 0)) for m in all_months] for name in corr_svc_names]
     temporal_correlations = []
-    top_svc_names = [s["name"] for s in service_list if s["tickets"] > 100][:15]
-
-    for i in range(len(top_svc_names)):
-        for j in range(i + 1, len(top_svc_names)):
-            a, b = top_svc_names[i], top_svc_names[j]
-            va = [svc_monthly[a].get(m, 0) for m in all_months]
-            vb = [svc_monthly[b].get(m, 0) for m in all_months]
-            # Pearson correlation
-            n = len(all_months)
-            if n < 6:
-                continue
-            mean_a = sum(va) / n
-            mean_b = sum(vb) / n
-            cov = sum((va[k] - mean_a) * (vb[k] - mean_b) for k in range(n))
-            std_a = (sum((va[k] - mean_a) ** 2 for k in range(n))) ** 0.5
-            std_b = (sum((vb[k] - mean_b) ** 2 for k in range(n))) ** 0.5
-            if std_a > 0 and std_b > 0:
-                corr = round(cov / (std_a * std_b), 3)
-                if abs(corr) >= 0.3:
-                    temporal_correlations.append({
-                        "serviceA": a,
-                        "serviceB": b,
-                        "correlation": corr,
-                        "direction": "positive" if corr > 0 else "negative",
-                    })
+    lagged = []
+
+    for (i, j), by_lag in lagged_correlations(svc_matrix).items():
+        a, b = corr_svc_names[i], corr_svc_names[j]
+        best_lag = max(by_lag, key=lambda lag: (abs(round(by_lag[lag], 3)), -abs(lag)))
+        best = round(by_lag[best_lag], 3)
+        corr = round(by_lag[0], 3) if 0 in by_lag else None
+        if corr is not None and abs(corr) >= 0.3:
+            temporal_correlations.append({
+                "serviceA": a,
+                "serviceB": b,
+                "correlation": corr,
+                "direction": "positive" if corr > 0 else "negative",
+                "bestLag": best_lag,
+                "bestLagCorrelation": best,
+            })
+        if best_lag and abs(best) >= 0.3:
+            leader, follower = (a, b) if best_lag > 0 else (b, a)
+            lagged.append({
+                "leader": leader,
+                "follower": follower,
+                "lagMonths": abs(best_lag),
+                "correlation": best,
+                "sameMonthCorrelation": corr,
+            })
     temporal_correlations.sort(key=lambda x: -abs(x["correlation"]))
+    lagged.sort(key=lambda x: -abs(x["correlation"]))
 
     # 5. SERVICE DEPENDENCY CHAINS: Incidents in A → follow-up in B?
     # (if customer has Incident in Service A, does Service B get more activity?)
@@ -2680,6 +4803,7 @@ def _build_cross_references(tickets, matched, matchers, customer_tickets, servic
         "teamOverlap": team_overlap,
         "customerBreadth": customer_breadth,
         "temporalCorrelations": temporal_correlations[:40],
+        "laggedCorrelations": lagged[:40],
         "dependencyChains": dependency_chains,
         "revenueServiceMap": revenue_service_map,
         "revenueEnriched": revenue_enriched,
@@ -2688,14 +4812,49 @@ def _build_cross_references(tickets, matched, matchers, customer_tickets, servic
             "teamOverlapPairs": len(team_overlap),
             "customersAnalyzed": len(cust_svc_map),
             "temporalCorrelations": len(temporal_correlations),
+            "laggedCorrelations": len(lagged),
             "dependencyChains": len(dependency_chains),
             "revenueLinked": len(revenue_enriched),
         },
     }
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate public/data.json and public/profiles2025.json.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass .cache/ (parse the Jira export directly, classify without the match cache,"
+                             " read Coda without the mirror)")
+    parser.add_argument("--match-engine", choices=MATCH_ENGINES, default="prefilter",
+                        help="regex engine for service matching (all engines give identical assignments)")
+    parser.add_argument("--desc-window", default="full", metavar="SPEC",
+                        help="description text scanned by pass 2: full, <N>kb, footer or <N>kb+footer (default: full)")
+    parser.add_argument("--profile-patterns", action="store_true",
+                        help="also write per-pattern evaluations/hits/wins/time to public/pattern_profile.{json,csv}")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="classify tickets in N worker processes (default: 1, in-process)")
+    parser.add_argument("--stopwords", type=Path, default=STOPWORDS, metavar="PATH",
+                        help=f"stopword list for unmatched word/n-gram statistics (default: scripts/{STOPWORDS.name})")
+    parser.add_argument("--role-signatures", type=Path, default=ROLE_SIGNATURES, metavar="PATH",
+                        help=f"role signature config for historic role carriers (default: scripts/{ROLE_SIGNATURES.name})")
+    parser.add_argument("--coda-concurrency", type=int, default=CODA_MAX_CONCURRENT, metavar="N",
+                        help=f"Coda tables fetched in parallel (default: {CODA_MAX_CONCURRENT}, 1 = one after another)")
+    parser.add_argument("--coda-ttl", type=int, default=CODA_CACHE_TTL, metavar="SECONDS",
+                        help=f"read synced Coda tables from the mirror this long before syncing again (default: {CODA_CACHE_TTL})")
+    parser.add_argument("--coda-full-sync", action="store_true",
+                        help=f"re-read every Coda table in full to drop deleted rows (default: every {CODA_FULL_SYNC_INTERVAL // 3600}h)")
+    parser.add_argument("--offline", action="store_true",
+                        help=f"don't contact Coda, read every table from the mirror in .cache/{CODA_MIRROR.name}")
+    args = parser.parse_args()
+    try:
+        DescriptionWindow(args.desc_window)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.offline and args.no_cache:
+        parser.error("--offline reads Coda from the mirror in .cache/, it can't be combined with --no-cache")
+    if args.match_engine == "re2" and _re2 is None:
+        print("  Warning: re2 module not installed (pip install google-re2), all patterns run on re")
+
     print("Loading data sources...")
-    tickets = load_jira()
+    tickets = load_tickets(use_cache=not args.no_cache)
     print(f"  Jira: {len(tickets)} tickets")
 
     services = load_services()
@@ -2716,6 +4875,38 @@ def main():
     roles_list = load_roles()
     print(f"  Roles: {len(roles_list)} roles")
 
+    try:
+        role_signatures = load_role_signatures(args.role_signatures, set(services))
+    except (OSError, ValueError) as e:
+        sys.exit(f"Invalid role signatures: {e}")
+    print(f"  Role signatures: {len(role_signatures)} ({args.role_signatures.name})")
+
+    try:
+        stopwords = load_stopwords(args.stopwords)
+    except OSError as e:
+        sys.exit(f"Cannot read stopwords: {e}")
+
+    client = configure_coda(args.coda_ttl, offline=args.offline, use_cache=not args.no_cache,
+                            full_sync=args.coda_full_sync)
+    t0 = time.perf_counter()
+    timings = prefetch_coda_tables(list(CODA_TABLES), args.coda_concurrency)
+    slowest = max(timings, key=lambda table_id: timings[table_id][0])
+    failed = [CODA_TABLES[table_id] for table_id, (_, error) in timings.items() if error]
+    print(f"  Coda: {len(timings)} tables in {time.perf_counter() - t0:.1f}s"
+          f" ({args.coda_concurrency} concurrent, slowest {CODA_TABLES[slowest]} {timings[slowest][0]:.1f}s"
+          + (f", failed: {', '.join(failed)}" if failed else "") + ")")
+    if client.mirror:
+        st = client.stats
+        print(f"  Coda mirror: {st['incremental']} tables synced incrementally ({st['changed']} changed rows),"
+              f" {st['full']} in full ({st['deleted']} deleted rows), {st['unchanged']} unchanged,"
+              f" {st['cached']} within TTL, {st['stale']} not synced" + (" (offline)" if args.offline else "")
+              + f"; {st['pages']} pages")
+    if client.stats["retries"]:
+        print(f"  Coda retries: {client.stats['retries']} ({client.stats['throttled']} rate limited),"
+              f" {client.stats['paced']:.1f}s waited for the rate limit across workers")
+    if client.broken:
+        print(f"  Warning: Coda unreachable ({client.broken}), tables read from the mirror")
+
     spaces_list = fetch_spaces()
     go2guy_count = sum(len(s["go2guys"]) for s in spaces_list)
     print(f"  Spaces: {len(spaces_list)} spaces ({go2guy_count} Go2Guy assignments, Coda API)")
@@ -2754,13 +4945,31 @@ def main():
         "teams": teams,
     }
 
+    print("\nMatching...")
+    t0 = time.perf_counter()
+    assignments, customers, unit_hits = classify_tickets(tickets, services, args.match_engine, args.workers,
+                                              use_cache=not args.no_cache, desc_window=args.desc_window)
+    print(f"  {len(assignments)} tickets classified in {time.perf_counter() - t0:.1f}s"
+          + (f" ({args.workers} workers)" if args.workers > 1 else ""))
+    hits, repeats = MATCH_STATS["cache_hits"], MATCH_STATS["cache_repeats"]
+    print(f"  Match cache: {(hits + repeats) / max(len(tickets), 1) * 100:.1f}% hit rate"
+          f" ({hits} from previous runs, {repeats} repeated content, {len(tickets) - hits - repeats} classified)")
+
     print("\nAnalyzing...")
-    output = analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_list, spaces_list, contracts_list, coda_data)
+    entity_table = load_entity_table()
+    output = analyze(tickets, services, sales, staff_list, units_list, kf_list, roles_list, spaces_list, contracts_list, coda_data,
+                     assignments=assignments, customers=customers, entity_table=entity_table,
+                     role_signatures=role_signatures, unit_hits=unit_hits,
+                     stopwords=stopwords)
 
     out_path = APP / "public" / "data.json"
     with open(out_path, "w") as f:
         json.dump(output, f, ensure_ascii=False, indent=None, separators=(",", ":"))
 
+    save_entity_table(entity_table)
+    print(f"  Entity resolution: {RESOLUTION_STATS['resolved']} names resolved,"
+          f" {RESOLUTION_STATS['cached']} reused from {ENTITY_TABLE.name}")
+
     size_kb = out_path.stat().st_size / 1024
     print(f"\nOutput: {out_path} ({size_kb:.1f} KB)")
     print(f"  Matched: {output['meta']['matchedTickets']} / {output['meta']['totalTickets']} ({output['meta']['matchRate']}%)")
@@ -2775,18 +4984,38 @@ def main():
     print(f"  Projects: {output['projects']['totalProjects']} ({output['projects']['totalSubTasks']} sub-tasks)")
     print(f"  Revenue groups: {len(output['revenue'])}")
     print(f"  Unmatched top words: {', '.join(w['word'] for w in output['unmatched']['topWords'][:10])}")
+    print(f"  Unmatched top phrases: {', '.join(p['phrase'] for p in output['unmatched']['topBigrams'][:5])}")
+    clusters = output["unmatched"]["clusters"]
+    print(f"  Unmatched clusters: {len(clusters)} (largest: {clusters[0]['size'] if clusters else 0} tickets)")
     if "historicRoles" in output:
         observable = sum(1 for r in output["historicRoles"] if r["observable"])
         carriers_total = sum(len(r["historicCarriers"]) for r in output["historicRoles"])
         print(f"  Historic Roles: {len(output['historicRoles'])} roles ({observable} observable, {carriers_total} carrier matches)")
 
     # ── Generate ERP 2025 profiles ──
-    generate_profiles(tickets, services, out_path.parent)
+    generate_profiles(tickets, services, out_path.parent, assignments, customers)
+
+    print(f"\nmatch_ticket calls: {MATCH_STATS['calls']} for {len(tickets)} tickets")
+
+    if args.profile_patterns:
+        print("\nProfiling patterns...")
+        rows = profile_patterns(tickets, services, args.desc_window)
+        path = write_pattern_profile(rows, out_path.parent, len(tickets))
+        dead = [r for r in rows if not r["hits"]]
+        never_win = [r for r in rows if r["hits"] and not r["wins"]]
+        total_ms = sum(r["time_ms"] for r in rows)
+        print(f"  {path} (+ .csv): {len(rows)} patterns, {len(dead)} never hit, {len(never_win)} hit but never win")
+        for r in rows[:5]:
+            share = r["time_ms"] / total_ms * 100 if total_ms else 0.0  # all times round to 0 on a tiny export
+            print(f"  {share:5.1f}%  {r['set']:<11} {r['pattern'][:60]}")
 
 
-def generate_profiles(tickets, services, public_dir):
+def generate_profiles(tickets, services, public_dir, assignments=None, customers=None):
     """Generate profiles2025.json with customer and project profiles for 2025."""
-    matchers = build_matchers(services)
+    if assignments is None:
+        assignments = assign_services(tickets, build_matchers(services))
+    if customers is None:
+        customers = {t["key"]: extract_customer(t) for t in tickets}
 
     # Filter 2025 tickets
     tickets_2025 = [t for t in tickets if t.get("created", "").startswith("2025")]
@@ -2797,7 +5026,7 @@ def generate_profiles(tickets, services, public_dir):
     # Customer profiles
     customer_tickets = defaultdict(list)
     for t in tickets_2025:
-        cust = extract_customer(t)
+        cust = customers[t["key"]]
         if cust:
             customer_tickets[cust].append(t)
 
@@ -2808,7 +5037,7 @@ def generate_profiles(tickets, services, public_dir):
         services_matched = Counter()
         unmatched_samples = []
         for t in tix:
-            svc = match_ticket(t, matchers)
+            svc = assignments[t["key"]]
             if svc:
                 services_matched[svc] += 1
             else:
@@ -2837,7 +5066,7 @@ def generate_profiles(tickets, services, public_dir):
     for proj_name, tix in sorted(project_groups.items(), key=lambda x: -len(x[1])):
         services_matched = Counter()
         for t in tix:
-            svc = match_ticket(t, matchers)
+            svc = assignments[t["key"]]
             if svc:
                 services_matched[svc] += 1
         matched_count = sum(services_matched.values())
@@ -2845,7 +5074,7 @@ def generate_profiles(tickets, services, public_dir):
         # Top customers in this project
         proj_customers = Counter()
         for t in tix:
-            c = extract_customer(t)
+            c = customers[t["key"]]
             if c:
                 proj_customers[c] += 1
         project_profiles.append({
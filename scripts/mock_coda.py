@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Coda rows API, for benchmarks and offline runs.
+
+Serves GET /docs/<doc>/tables/<table>/rows with limit/pageToken pagination over
+in-memory tables (in list order, or newest first with sortBy=updatedAt), with a
+configurable per-request latency and failure injection per table: an HTTP
+status to answer with, or a hang that lasts until the client gives up.
+rate_limit=(requests, seconds) answers 429 with Retry-After beyond that many
+requests in any window, like Coda's API, and flaky is the share of requests
+answered with a transient 503. Requests are counted per table together with the
+peak number of requests being answered at once (hung requests aside).
+
+Connections are HTTP/1.1 keep-alive, optionally over TLS with a throwaway
+self-signed certificate (needs the openssl command line tool), and bodies are
+gzipped for clients that accept it. Pages carry an ETag; a matching
+If-None-Match is answered with 304 Not Modified. connect_delay is slept once
+per new connection to stand in for the TCP and TLS round trips of a handshake.
+
+Usage:
+  python3 scripts/mock_coda.py                     # serve synthetic tables on 127.0.0.1:8765
+  CODA_API_URL=http://127.0.0.1:8765 python3 scripts/generate_data.py
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import select
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import generate_data as gd
+
+ROWS_PATH = re.compile(r"^/docs/([^/]+)/tables/([^/]+)/rows$")
+
+
+def timestamp(seconds):
+    """Coda-style UTC timestamp, seconds after 2025-01-01."""
+    return (datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def synthetic_tables(table_ids, rows_per_table=450):
+    """{table_id: rows} of simple rows whose values repeat the table id and row number."""
+    return {
+        table_id: [{"id": f"i-{n}", "createdAt": timestamp(n), "updatedAt": timestamp(n),
+                    "values": {"c-WpKg032DXl": f"{table_id} {n}"}}
+                   for n in range(rows_per_table)]
+        for table_id in table_ids
+    }
+
+
+def self_signed_cert(directory):
+    """Write a self-signed certificate for 127.0.0.1 into directory; returns (certfile, keyfile)."""
+    cert, key = Path(directory) / "mock_coda.crt", Path(directory) / "mock_coda.key"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", str(key), "-out", str(cert)], check=True, capture_output=True)
+    return str(cert), str(key)
+
+
+class _Server(ThreadingHTTPServer):
+    # the default backlog of 5 drops connects when a client opens 8 at once; the
+    # SYN retry then takes a second, long enough to trip the client's breaker
+    request_queue_size = 64
+
+
+class MockCoda:
+    """Threaded mock Coda server; use as a context manager or start()/stop().
+
+    With tls=True the server speaks HTTPS; client_context() returns an SSL context
+    that trusts its certificate.
+    """
+
+    def __init__(self, tables, latency=0.0, fail=None, hang=(), hang_s=30.0, port=0,
+                 tls=False, connect_delay=0.0, gzip=True, rate_limit=None, flaky=0.0, seed=7):
+        self.tables = tables
+        self.latency = latency       # seconds per request, or {table_id: seconds}
+        self.fail = dict(fail or {})  # {table_id: HTTP status}
+        self.hang = set(hang)
+        self.hang_s = hang_s
+        self.connect_delay = connect_delay
+        self.gzip = gzip
+        self.rate_limit = rate_limit
+        self.flaky = flaky
+        self._recent = deque()  # arrival times within the rate limit window
+        self._rng = random.Random(seed)
+        self.status_counts = Counter()
+        self.requests = Counter()
+        self.connections = 0
+        self.bytes_sent = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.server = _Server(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.cafile = None
+        self.server_context = None
+        if tls:
+            self._tmp = tempfile.TemporaryDirectory()
+            self.cafile, keyfile = self_signed_cert(self._tmp.name)
+            self.server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.server_context.load_cert_chain(self.cafile, keyfile)
+        scheme = "https" if tls else "http"
+        self.url = f"{scheme}://127.0.0.1:{self.server.server_address[1]}"
+
+    def client_context(self):
+        """SSL context for clients of this server (None without TLS)."""
+        return ssl.create_default_context(cafile=self.cafile) if self.cafile else None
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                with mock._lock:
+                    mock.connections += 1
+                mock._stop.wait(mock.connect_delay)
+                if mock.server_context:
+                    self.request = mock.server_context.wrap_socket(self.request, server_side=True)
+                super().setup()
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                m = ROWS_PATH.match(parts.path)
+                if not m or m.group(2) not in mock.tables:
+                    return self._send(404, {"message": "Not Found"})
+                table_id = m.group(2)
+                with mock._lock:
+                    mock.requests[table_id] += 1
+                if table_id in mock.hang:
+                    return self._hang()
+                refusal = mock._refusal()
+                if refusal:
+                    return self._send(*refusal)
+                with mock._lock:
+                    mock.in_flight += 1
+                    mock.peak_in_flight = max(mock.peak_in_flight, mock.in_flight)
+                try:
+                    mock._stop.wait(mock._latency(table_id))
+                    if table_id in mock.fail:
+                        return self._send(mock.fail[table_id], {"message": "injected failure"})
+                    query = parse_qs(parts.query)
+                    limit = int(query.get("limit", ["200"])[0])
+                    start = int(query.get("pageToken", ["0"])[0])
+                    rows = mock.tables[table_id]
+                    if query.get("sortBy") == ["updatedAt"]:
+                        rows = sorted(rows, key=lambda row: row["updatedAt"], reverse=True)
+                    body = {"items": rows[start:start + limit]}
+                    if start + limit < len(rows):
+                        body["nextPageToken"] = str(start + limit)
+                    etag = '"%s"' % hashlib.blake2b(json.dumps(body).encode(), digest_size=8).hexdigest()
+                    if self.headers.get("If-None-Match") == etag:
+                        with mock._lock:
+                            mock.not_modified += 1
+                        return self._send(304, None, etag=etag)
+                    self._send(200, body, "gzip" in self.headers.get("Accept-Encoding", ""), etag)
+                finally:
+                    with mock._lock:
+                        mock.in_flight -= 1
+
+            def _hang(self):
+                """Answer nothing until hang_s passes or the client disconnects."""
+                self.close_connection = True
+                deadline = time.monotonic() + mock.hang_s
+                while not mock._stop.is_set() and time.monotonic() < deadline:
+                    readable, _, _ = select.select([self.connection], [], [], 0.02)
+                    try:
+                        if readable and not self.connection.recv(1):
+                            return
+                    except OSError:
+                        return
+
+            def _send(self, status, body, compress=False, etag=None, headers=None):
+                data = json.dumps(body).encode() if body is not None else b""
+                if compress and mock.gzip:
+                    data = gzip.compress(data, compresslevel=6)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if etag:
+                    self.send_header("ETag", etag)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if compress and mock.gzip:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except OSError:  # client gave up (timeout)
+                    self.close_connection = True
+                    return
+                with mock._lock:
+                    mock.bytes_sent += len(data)
+
+        return Handler
+
+    def _refusal(self):
+        """(status, body, ...) for a throttled or flaky request, None to serve it."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate_limit:
+                limit, window = self.rate_limit
+                while self._recent and self._recent[0] <= now - window:
+                    self._recent.popleft()
+                if len(self._recent) >= limit:
+                    self.status_counts[429] += 1
+                    retry_after = max(1, math.ceil(self._recent[0] + window - now))
+                    return 429, {"message": "Rate limit exceeded"}, False, None, {"Retry-After": str(retry_after)}
+                self._recent.append(now)
+            if self.flaky and self._rng.random() < self.flaky:
+                self.status_counts[503] += 1
+                return 503, {"message": "Service Unavailable"}
+        return None
+
+    def _latency(self, table_id):
+        if isinstance(self.latency, dict):
+            return self.latency.get(table_id, 0.0)
+        return self.latency
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.peak_in_flight = 0
+            self.connections = 0
+            self.bytes_sent = 0
+            self.not_modified = 0
+            self.status_counts.clear()
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        if self.cafile:
+            self._tmp.cleanup()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=450, help="rows per table")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--tls", action="store_true", help="serve HTTPS with a self-signed certificate")
+    args = parser.parse_args()
+    mock = MockCoda(synthetic_tables(gd.CODA_TABLES, args.rows), latency=args.latency, port=args.port, tls=args.tls)
+    print(f"Mock Coda on {mock.url} ({len(mock.tables)} tables × {args.rows} rows), Ctrl-C to stop")
+    if mock.cafile:
+        print(f"  certificate: {mock.cafile} (SSL_CERT_FILE for clients)")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
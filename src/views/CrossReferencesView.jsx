@@ -171,10 +171,13 @@ function CooccurrenceTab({ cr, onServiceClick }) {
 function TemporalTab({ cr, onServiceClick }) {
   const correlations = cr.temporalCorrelations || []
 
+  const lagged = cr.laggedCorrelations || []
+
   const positive = correlations.filter(c => c.correlation > 0)
   const negative = correlations.filter(c => c.correlation < 0)
 
   return (
+    <>
     <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: 16 }}>
       <div style={sectionStyle}>
         <h3 style={{ fontSize: 14, fontWeight: 600, color: theme.text.primary, marginBottom: 4 }}>Positive Korrelationen</h3>
@@ -215,6 +218,23 @@ function TemporalTab({ cr, onServiceClick }) {
         </div>
       </div>
     </div>
+
+    {lagged.length > 0 && (
+      <div style={{ ...sectionStyle, marginTop: 16 }}>
+        <h3 style={{ fontSize: 14, fontWeight: 600, color: theme.text.primary, marginBottom: 4 }}>Zeitversetzte Korrelationen</h3>
+        <p style={{ fontSize: 11, color: theme.text.muted, marginBottom: 16 }}>Service A läuft Service B um 1–3 Monate voraus (Pearson r beim besten Versatz)</p>
+        {lagged.map((c, i) => (
+          <div key={i} style={{ display: 'flex', alignItems: 'center', gap: 8, padding: '6px 0', borderBottom: `1px solid ${theme.border.subtle}` }}>
+            <span style={{ fontSize: 12, color: theme.accent, cursor: 'pointer', flex: 1 }} onClick={() => onServiceClick?.(c.leader)}>{shorten(c.leader)}</span>
+            <span style={{ fontSize: 11, color: theme.text.muted }}>→ {c.lagMonths} M →</span>
+            <span style={{ fontSize: 12, color: theme.accent, cursor: 'pointer', flex: 1 }} onClick={() => onServiceClick?.(c.follower)}>{shorten(c.follower)}</span>
+            <CorrelationBar value={c.correlation} />
+            <span style={{ fontSize: 11, fontWeight: 600, color: c.correlation > 0 ? theme.semantic.success : theme.semantic.error, width: 50, textAlign: 'right' }}>r={c.correlation}</span>
+          </div>
+        ))}
+      </div>
+    )}
+    </>
   )
 }
 
@@ -140,14 +140,53 @@ export function UnmatchedView({ data }) {
                 <span key={w.word} style={{
                   fontSize: size, color: theme.accent, opacity,
                   padding: '2px 6px', cursor: 'default',
-                }} title={`${w.count} Treffer`}>
+                }} title={`${w.count} Treffer${w.examples?.length ? ` (z.B. ${w.examples.join(', ')})` : ''}`}>
                   {w.word}
                 </span>
               )
             })}
           </div>
+          {[...(u.topBigrams || []), ...(u.topTrigrams || [])].length > 0 && (
+            <>
+              <h4 style={{ fontSize: 12, fontWeight: 600, color: theme.text.primary, margin: '16px 0 8px' }}>Haeufige Phrasen</h4>
+              {[...(u.topBigrams || []).slice(0, 10), ...(u.topTrigrams || []).slice(0, 10)].map(p => (
+                <div key={p.phrase} style={{ display: 'flex', gap: 8, marginBottom: 4, fontSize: 12 }}>
+                  <span style={{ flex: 1, color: theme.accent }}>{p.phrase}</span>
+                  <span style={{ color: theme.text.muted }} title={(p.examples || []).join(', ')}>{p.count.toLocaleString()}</span>
+                </div>
+              ))}
+            </>
+          )}
         </div>
       </div>
+
+      {/* Near-duplicate clusters (alias candidates) */}
+      {(u.clusters || []).length > 0 && (
+        <div style={sectionStyle}>
+          <h3 style={{ fontSize: 14, fontWeight: 600, color: theme.text.primary, marginBottom: 4 }}>Aehnliche Tickets (Cluster)</h3>
+          <p style={{ fontSize: 11, color: theme.text.muted, marginBottom: 12 }}>Gruppen nahezu gleicher Summaries mit Vorschlag fuer ein neues Alias</p>
+          <table style={{ width: '100%', borderCollapse: 'collapse', fontSize: 12 }}>
+            <thead>
+              <tr>
+                {['Tickets', 'Beispiel', 'Projekt', 'Bearbeiter', 'Alias-Vorschlag'].map(h => (
+                  <th key={h} style={{ textAlign: 'left', padding: '6px 10px', borderBottom: `1px solid ${theme.border.default}`, color: theme.text.muted, fontWeight: 600 }}>{h}</th>
+                ))}
+              </tr>
+            </thead>
+            <tbody>
+              {u.clusters.map((c, i) => (
+                <tr key={i}>
+                  <td style={{ padding: '6px 10px', borderBottom: `1px solid ${theme.border.subtle}`, color: theme.text.primary, fontWeight: 600 }}>{c.size}</td>
+                  <td style={{ padding: '6px 10px', borderBottom: `1px solid ${theme.border.subtle}`, color: theme.text.secondary }} title={c.examples.join(', ')}>{c.representative}</td>
+                  <td style={{ padding: '6px 10px', borderBottom: `1px solid ${theme.border.subtle}`, color: theme.text.muted }}>{c.project}</td>
+                  <td style={{ padding: '6px 10px', borderBottom: `1px solid ${theme.border.subtle}`, color: theme.text.muted }}>{c.assignee || '–'}</td>
+                  <td style={{ padding: '6px 10px', borderBottom: `1px solid ${theme.border.subtle}`, color: theme.accent, fontFamily: 'monospace' }} title={c.suggestedAlias ? `in ${Math.round(c.aliasCoverage * 100)}% der Summaries` : ''}>{c.suggestedAlias || '–'}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
     </div>
   )
 }